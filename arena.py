@@ -0,0 +1,411 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import deque
+
+from snake_engine import DIFFICULTY_FEATURES, DIRECTIONS, DOWN, LEFT, OPPOSITE, RIGHT, UP
+
+# Multiplayer arena: one authoritative server runs a single shared board
+# with up to hundreds of snakes, each moving by the single-player rules
+# (wrapping or walls per difficulty, 180 degree turns ignored, growth by
+# the difficulty's grow_amount, the tail still counts as an obstacle on
+# the tick it moves away).
+#
+# Every snake's cells are counted in one shared occupancy grid, so a move
+# is checked against all bodies with a single lookup, and new heads are
+# bucketed by cell to find head-on crashes. A tick costs O(snakes), never
+# O(snakes^2).
+#
+# Protocol: newline-delimited JSON over TCP, like the leaderboard.
+#   client -> {"op": "join", "name": "bob", "watch": true}
+#          <- {"op": "welcome", "id": 7, "width": .., "height": .., ...}
+#   client -> {"op": "turn", "direction": "up"}      (latest one per tick wins)
+#   client -> {"op": "stats"}  <- {"op": "stats", "players": .., "tick_p50_ms": .., ...}
+# Watching clients get the whole board once ({"op": "state", ...}, sent at
+# a tick boundary) and then one {"op": "tick", ...} frame per tick with
+# what changed: [id, head cell, grew] per move, snakes that died, left or
+# (re)spawned, food eaten and added. Mirrors apply them in the order
+# spawned, left, died, moves, eaten, food. Cells are y * width + x. A frame
+# is encoded once and the same bytes go to every watcher.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+DEFAULT_WIDTH = 160
+DEFAULT_HEIGHT = 120
+DEFAULT_DIFFICULTY = "Medium"
+MAX_PLAYERS = 256
+FOOD_PER_SNAKE = 0.5  # Food kept on the board per live snake (at least one)
+RESPAWN_TICKS = 24  # Ticks a crashed snake sits out
+SPAWN_ATTEMPTS = 32  # Random cells tried before a spawn is put off a tick
+SPAWN_CLEARANCE = 4  # Free cells needed ahead of a new snake
+MAX_CLIENT_BUFFER = 1 << 20  # Unsent bytes before a watcher is dropped
+TICK_HISTORY = 512  # Tick timings kept for stats
+
+DIRECTION_NAMES = {"up": UP, "down": DOWN, "left": LEFT, "right": RIGHT}
+
+
+class ArenaSnake:
+    __slots__ = ("id", "name", "body", "direction", "next_direction", "pending_growth",
+                 "alive", "score", "respawn_at")
+
+    def __init__(self, snake_id, name):
+        self.id = snake_id
+        self.name = name
+        self.body = deque()  # Cells, head first
+        self.direction = RIGHT
+        self.next_direction = None
+        self.pending_growth = 0
+        self.alive = False
+        self.score = 0
+        self.respawn_at = 0
+
+
+class Arena:
+    # The shared board and its rules, with no networking
+    def __init__(self, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT,
+                 difficulty=DEFAULT_DIFFICULTY, seed=None):
+        features = DIFFICULTY_FEATURES[difficulty]
+        self.width = width
+        self.height = height
+        self.difficulty = difficulty
+        self.wall_collision = features["wall_collision"]
+        self.grow_amount = features["grow_amount"]
+        self.points = int(10 * features["score_multiplier"])
+        self.rng = random.Random(seed)
+        self.occupancy = bytearray(width * height)  # Segments on each cell, all snakes
+        self.food = set()
+        self.snakes = {}
+        self.next_id = 1
+        self.ticks = 0
+        self.reset_events()
+
+    def reset_events(self):
+        self.events = {"moves": [], "died": [], "left": [], "spawned": [],
+                       "eaten": [], "food": []}
+
+    def add_snake(self, name=""):
+        snake = ArenaSnake(self.next_id, name)
+        self.next_id += 1
+        self.snakes[snake.id] = snake
+        self.spawn(snake)
+        return snake
+
+    def remove_snake(self, snake_id):
+        snake = self.snakes.pop(snake_id, None)
+        if snake is None:
+            return
+        self.clear_body(snake)
+        self.events["left"].append(snake_id)
+
+    def turn(self, snake_id, direction):
+        snake = self.snakes.get(snake_id)
+        if snake is not None:
+            snake.next_direction = direction
+
+    def clear_body(self, snake):
+        occupancy = self.occupancy
+        for cell in snake.body:
+            occupancy[cell] -= 1
+        snake.body.clear()
+
+    def neighbor(self, cell, direction):
+        # The cell one step away, or None past a wall
+        x = cell % self.width + direction[0]
+        y = cell // self.width + direction[1]
+        if self.wall_collision:
+            if x < 0 or x >= self.width or y < 0 or y >= self.height:
+                return None
+        else:
+            x %= self.width
+            y %= self.height
+        return y * self.width + x
+
+    def spawn(self, snake):
+        # One-cell snake on a random free cell with room to move; when the
+        # board is too crowded it tries again next tick
+        rng = self.rng
+        occupancy = self.occupancy
+        size = self.width * self.height
+        for _ in range(SPAWN_ATTEMPTS):
+            cell = rng.randrange(size)
+            if occupancy[cell] or cell in self.food:
+                continue
+            direction = rng.choice(DIRECTIONS)
+            ahead = cell
+            for _ in range(SPAWN_CLEARANCE):
+                ahead = self.neighbor(ahead, direction)
+                if ahead is None or occupancy[ahead]:
+                    break
+            else:
+                snake.body.append(cell)
+                occupancy[cell] += 1
+                snake.direction = direction
+                snake.next_direction = None
+                snake.pending_growth = 0
+                snake.score = 0
+                snake.alive = True
+                self.events["spawned"].append(
+                    [snake.id, [cell], [direction[0], direction[1]]])
+                return True
+        snake.respawn_at = self.ticks + 1
+        return False
+
+    def place_food(self):
+        target = max(1, int(sum(snake.alive for snake in self.snakes.values()) * FOOD_PER_SNAKE))
+        size = self.width * self.height
+        occupancy = self.occupancy
+        attempts = SPAWN_ATTEMPTS
+        while len(self.food) < target and attempts:
+            cell = self.rng.randrange(size)
+            if occupancy[cell] or cell in self.food:
+                attempts -= 1
+                continue
+            self.food.add(cell)
+            self.events["food"].append(cell)
+
+    def step(self):
+        # Advance every snake one tick and return what changed since the
+        # last step
+        self.ticks += 1
+        occupancy = self.occupancy
+        events = self.events
+
+        # Everyone's new head first, so all moves see the same board
+        moves = []
+        heads = {}
+        for snake in self.snakes.values():
+            if not snake.alive:
+                continue
+            turn = snake.next_direction
+            if turn is not None and turn != OPPOSITE[snake.direction]:
+                snake.direction = turn
+            snake.next_direction = None
+            cell = self.neighbor(snake.body[0], snake.direction)
+            moves.append((snake, cell))
+            if cell is not None:
+                heads[cell] = heads.get(cell, 0) + 1
+
+        crashed = [snake for snake, cell in moves
+                   if cell is None or occupancy[cell] or heads[cell] > 1]
+        for snake in crashed:
+            self.clear_body(snake)
+            snake.alive = False
+            snake.respawn_at = self.ticks + RESPAWN_TICKS
+            events["died"].append(snake.id)
+
+        food = self.food
+        for snake, cell in moves:
+            if not snake.alive:
+                continue
+            body = snake.body
+            body.appendleft(cell)
+            occupancy[cell] += 1
+            grew = snake.pending_growth > 0
+            if grew:
+                snake.pending_growth -= 1
+            else:
+                occupancy[body.pop()] -= 1
+            if cell in food:
+                food.remove(cell)
+                events["eaten"].append(cell)
+                snake.pending_growth += self.grow_amount
+                snake.score += self.points
+            events["moves"].append([snake.id, cell, int(grew)])
+
+        for snake in self.snakes.values():
+            if not snake.alive and snake.respawn_at <= self.ticks:
+                self.spawn(snake)
+        self.place_food()
+
+        events["tick"] = self.ticks
+        self.reset_events()
+        return events
+
+    def state(self):
+        # The whole board, for a client that starts watching
+        return {
+            "op": "state", "tick": self.ticks,
+            "snakes": [[snake.id, list(snake.body), [snake.direction[0], snake.direction[1]]]
+                       for snake in self.snakes.values() if snake.alive],
+            "food": list(self.food),
+        }
+
+
+class ArenaServer:
+    # Runs the arena's tick loop and talks to clients. Inputs only set a
+    # snake's next direction; nothing a client does waits for a tick or
+    # makes a tick wait for a client.
+    def __init__(self, arena, tick_rate=None, max_players=MAX_PLAYERS):
+        self.arena = arena
+        self.tick_rate = tick_rate or DIFFICULTY_FEATURES[arena.difficulty]["speed"]
+        self.max_players = max_players
+        self.watchers = set()
+        self.new_watchers = set()  # Get the full state after the next tick
+        self.tick_times = deque(maxlen=TICK_HISTORY)
+        self.clients = {}  # Connection handler task -> its writer
+        self.server = None
+        self.ticker = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.ticker = asyncio.create_task(self.tick_loop())
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        self.server.close()
+        self.ticker.cancel()
+        try:
+            await self.ticker
+        except asyncio.CancelledError:
+            pass
+        # Hang up on everyone and let the handlers finish on their own
+        for writer in self.clients.values():
+            writer.close()
+        await asyncio.gather(*self.clients, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def tick_loop(self):
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time() + interval
+        while True:
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            start = time.perf_counter()
+            self.tick()
+            self.tick_times.append(time.perf_counter() - start)
+            # A late tick pushes the schedule back rather than bunching up
+            next_tick = max(next_tick + interval, loop.time())
+
+    def tick(self):
+        frame = encode(dict(self.arena.step(), op="tick"))
+        for writer in list(self.watchers):
+            self.send(writer, frame)
+        if self.new_watchers:
+            state = encode(self.arena.state())
+            for writer in self.new_watchers:
+                self.send(writer, state)
+            self.watchers |= self.new_watchers
+            self.new_watchers.clear()
+
+    def send(self, writer, data):
+        # A watcher that can't keep up is dropped rather than buffered forever
+        if writer.is_closing():
+            self.watchers.discard(writer)
+            return
+        if writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+            self.watchers.discard(writer)
+            writer.close()
+            return
+        writer.write(data)
+
+    def stats(self):
+        times = sorted(self.tick_times)
+        percentile = (lambda f: times[min(int(len(times) * f), len(times) - 1)] * 1000
+                      if times else 0.0)
+        return {
+            "op": "stats", "tick": self.arena.ticks, "tick_rate": self.tick_rate,
+            "players": len(self.arena.snakes), "watchers": len(self.watchers),
+            "tick_p50_ms": percentile(0.50), "tick_p99_ms": percentile(0.99),
+            "tick_max_ms": times[-1] * 1000 if times else 0.0,
+        }
+
+    def handle(self, request, client):
+        # Returns the reply, if any
+        op = request.get("op")
+        arena = self.arena
+        if op == "turn":
+            direction = DIRECTION_NAMES.get(request.get("direction"))
+            if direction is None:
+                raise ValueError("direction must be up, down, left or right")
+            if client["snake"] is not None:
+                arena.turn(client["snake"], direction)
+            return None
+        if op == "join":
+            if client["snake"] is not None:
+                raise ValueError("already joined")
+            if len(arena.snakes) >= self.max_players:
+                raise ValueError("arena is full")
+            client["snake"] = arena.add_snake(str(request.get("name", ""))).id
+            if request.get("watch", True):
+                self.new_watchers.add(client["writer"])
+            return {"op": "welcome", "id": client["snake"], "width": arena.width,
+                    "height": arena.height, "wall_collision": arena.wall_collision,
+                    "tick_rate": self.tick_rate}
+        if op == "watch":
+            self.new_watchers.add(client["writer"])
+            return {"op": "welcome", "id": None, "width": arena.width,
+                    "height": arena.height, "wall_collision": arena.wall_collision,
+                    "tick_rate": self.tick_rate}
+        if op == "stats":
+            return self.stats()
+        raise ValueError(f"unknown op {op!r}")
+
+    async def handle_client(self, reader, writer):
+        client = {"snake": None, "writer": writer}
+        task = asyncio.current_task()
+        self.clients[task] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = self.handle(json.loads(line), client)
+                except (ValueError, AttributeError) as e:
+                    response = {"op": "error", "error": str(e)}
+                if response is not None:
+                    writer.write(encode(response))
+        except ConnectionError:
+            pass
+        finally:
+            if client["snake"] is not None:
+                self.arena.remove_snake(client["snake"])
+            self.watchers.discard(writer)
+            self.new_watchers.discard(writer)
+            self.clients.pop(task, None)
+            writer.close()
+
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+async def serve(args):
+    arena = Arena(args.width, args.height, args.difficulty, seed=args.seed)
+    server = ArenaServer(arena, args.tick_rate, args.max_players)
+    host, port = await server.start(args.host, args.port)
+    print(f"Arena {arena.width}x{arena.height} ({arena.difficulty}, "
+          f"{server.tick_rate} ticks/s) listening on {host}:{port}")
+    try:
+        while True:
+            await asyncio.sleep(5)
+            stats = server.stats()
+            print(f"tick {stats['tick']}  players {stats['players']}  "
+                  f"tick p50 {stats['tick_p50_ms']:.2f} ms  p99 {stats['tick_p99_ms']:.2f} ms")
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multiplayer Modern Snake arena server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT)
+    parser.add_argument("--difficulty", default=DEFAULT_DIFFICULTY, choices=list(DIFFICULTY_FEATURES))
+    parser.add_argument("--tick-rate", type=float,
+                        help="ticks per second (default: the difficulty's speed)")
+    parser.add_argument("--max-players", type=int, default=MAX_PLAYERS)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+from collections import deque
+
+from arena import DEFAULT_DIFFICULTY, DEFAULT_HEIGHT, DEFAULT_HOST, DEFAULT_WIDTH, Arena, ArenaServer, encode
+from leaderboard import parse_address
+from snake_engine import DIRECTIONS, DOWN, LEFT, OPPOSITE, RIGHT, UP
+
+# Scripted bot clients for the arena server, and a scaling test built on
+# them. Each bot has its own connection and only sends turns; one watcher
+# connection per process keeps a mirror of the board that every bot steers
+# by, so a hundred bots cost one stream of tick frames, not a hundred.
+# Without --server each bot count gets a fresh in-process server and the
+# server's tick timings are reported per count.
+
+DIRECTION_NAMES = {UP: "up", DOWN: "down", LEFT: "left", RIGHT: "right"}
+DEFAULT_COUNTS = (10, 50, 100, 200)
+
+
+class BoardMirror:
+    # Client-side copy of the board, kept up to date from state and tick
+    # frames
+    def __init__(self, welcome):
+        self.width = welcome["width"]
+        self.height = welcome["height"]
+        self.wall_collision = welcome["wall_collision"]
+        self.occupancy = bytearray(self.width * self.height)
+        self.bodies = {}
+        self.directions = {}
+        self.food = set()
+        self.tick = 0
+
+    def add_body(self, snake_id, cells, direction):
+        self.bodies[snake_id] = deque(cells)
+        self.directions[snake_id] = tuple(direction)
+        for cell in cells:
+            self.occupancy[cell] += 1
+
+    def remove_body(self, snake_id):
+        for cell in self.bodies.pop(snake_id, ()):
+            self.occupancy[cell] -= 1
+        self.directions.pop(snake_id, None)
+
+    def apply(self, message):
+        op = message["op"]
+        if op == "state":
+            self.occupancy = bytearray(self.width * self.height)
+            self.bodies.clear()
+            self.directions.clear()
+            for snake_id, cells, direction in message["snakes"]:
+                self.add_body(snake_id, cells, direction)
+            self.food = set(message["food"])
+        elif op == "tick":
+            for snake_id, cells, direction in message["spawned"]:
+                self.add_body(snake_id, cells, direction)
+            for snake_id in message["left"]:
+                self.remove_body(snake_id)
+            for snake_id in message["died"]:
+                self.remove_body(snake_id)
+            occupancy = self.occupancy
+            for snake_id, cell, grew in message["moves"]:
+                body = self.bodies[snake_id]
+                self.directions[snake_id] = self.step_direction(body[0], cell)
+                body.appendleft(cell)
+                occupancy[cell] += 1
+                if not grew:
+                    occupancy[body.pop()] -= 1
+            self.food.difference_update(message["eaten"])
+            self.food.update(message["food"])
+        else:
+            return
+        self.tick = message["tick"]
+
+    def step_direction(self, cell, step):
+        dx = step % self.width - cell % self.width
+        dy = step // self.width - cell // self.width
+        # A move through a wrapping edge looks like a jump across the board
+        dx = -1 if dx > 1 else 1 if dx < -1 else dx
+        dy = -1 if dy > 1 else 1 if dy < -1 else dy
+        return (dx, dy)
+
+    def neighbor(self, cell, direction):
+        x = cell % self.width + direction[0]
+        y = cell // self.width + direction[1]
+        if self.wall_collision:
+            if x < 0 or x >= self.width or y < 0 or y >= self.height:
+                return None
+        else:
+            x %= self.width
+            y %= self.height
+        return y * self.width + x
+
+    def distance(self, a, b):
+        dx = abs(a % self.width - b % self.width)
+        dy = abs(a // self.width - b // self.width)
+        if not self.wall_collision:
+            dx = min(dx, self.width - dx)
+            dy = min(dy, self.height - dy)
+        return dx + dy
+
+
+class Bot:
+    # Heads for one food at a time, picking the free neighbour closest to
+    # it; with no free neighbour it keeps going and crashes
+    def __init__(self, rng):
+        self.rng = rng
+        self.id = None
+        self.writer = None
+        self.target = None
+
+    async def connect(self, host, port, name):
+        reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(encode({"op": "join", "name": name, "watch": False}))
+        welcome = json.loads(await reader.readline())
+        if welcome["op"] != "welcome":
+            raise RuntimeError(welcome.get("error", "join refused"))
+        self.id = welcome["id"]
+        # Nothing else is sent to a non-watching player; keep draining in
+        # case of errors so the socket never backs up
+        asyncio.create_task(self.drain(reader))
+
+    async def drain(self, reader):
+        while await reader.readline():
+            pass
+
+    def decide(self, mirror):
+        body = mirror.bodies.get(self.id)
+        if body is None:
+            return
+        head = body[0]
+        direction = mirror.directions[self.id]
+        if self.target not in mirror.food:
+            self.target = self.rng.choice(tuple(mirror.food)) if mirror.food else None
+        best, best_distance = None, None
+        for option in DIRECTIONS:
+            if option == OPPOSITE[direction]:
+                continue
+            cell = mirror.neighbor(head, option)
+            if cell is None or mirror.occupancy[cell]:
+                continue
+            distance = mirror.distance(cell, self.target) if self.target is not None else 0
+            if best is None or distance < best_distance or (
+                    distance == best_distance and option == direction):
+                best, best_distance = option, distance
+        if best is not None and best != direction:
+            self.writer.write(encode({"op": "turn", "direction": DIRECTION_NAMES[best]}))
+
+    def close(self):
+        self.writer.close()
+
+
+async def run_bots(host, port, count, ticks, seed):
+    # Connects `count` bots, plays `ticks` ticks and returns the server's
+    # stats
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode({"op": "watch"}))
+    mirror = BoardMirror(json.loads(await reader.readline()))
+    bots = [Bot(random.Random(rng.getrandbits(32))) for _ in range(count)]
+    for i, bot in enumerate(bots):
+        await bot.connect(host, port, f"bot{i}")
+
+    first = None
+    while True:
+        message = json.loads(await reader.readline())
+        if message["op"] == "stats":
+            break
+        mirror.apply(message)
+        if message["op"] not in ("state", "tick"):
+            continue
+        if first is None:
+            first = mirror.tick
+        elif mirror.tick - first == ticks:
+            writer.write(encode({"op": "stats"}))
+        for bot in bots:
+            bot.decide(mirror)
+    for bot in bots:
+        bot.close()
+    writer.close()
+    return message
+
+
+async def scaling_test(args):
+    print(f"{'bots':>6} {'ticks':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'us/snake':>9}")
+    for count in args.bots:
+        server = None
+        if args.server:
+            host, port = parse_address(args.server)
+        else:
+            arena = Arena(args.width, args.height, args.difficulty, seed=args.seed)
+            server = ArenaServer(arena, args.tick_rate, max_players=count)
+            host, port = await server.start(DEFAULT_HOST, 0)
+        stats = await run_bots(host, port, count, args.ticks, args.seed)
+        if server is not None:
+            await server.close()
+        print(f"{count:6} {stats['tick']:7} {stats['tick_p50_ms']:8.2f} {stats['tick_p99_ms']:8.2f} "
+              f"{stats['tick_max_ms']:8.2f} {stats['tick_p50_ms'] * 1000 / count:9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scripted bots and scaling test for the arena")
+    parser.add_argument("--server", metavar="HOST:PORT",
+                        help="arena to join (default: a fresh in-process one per bot count)")
+    parser.add_argument("--bots", type=int, nargs="+", default=list(DEFAULT_COUNTS))
+    parser.add_argument("--ticks", type=int, default=300, help="ticks to play per bot count")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT)
+    parser.add_argument("--difficulty", default=DEFAULT_DIFFICULTY)
+    parser.add_argument("--tick-rate", type=float, default=30,
+                        help="in-process server speed, ticks per second")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    asyncio.run(scaling_test(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
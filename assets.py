@@ -0,0 +1,155 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import pygame
+
+# File assets are listed in a manifest (assets.json, next to this module).
+# Sounds are decoded once: the clip the manifest asks for is stored as raw
+# PCM in the mixer's format under .asset_cache/ in the working directory
+# (where the game keeps its other files), named by a hash of the file's
+# contents, the clip and the mixer format, so later launches read it
+# straight into pygame.mixer.Sound(buffer=...) without touching the MP3
+# decoder. Editing or replacing a file changes its hash and it's decoded
+# again.
+#
+# Surfaces the game builds and keeps (layers, atlases, sprites, text) go
+# through display_format() so they're stored in the display's pixel format
+# and blitting them is a plain copy instead of a per-pixel conversion.
+
+MANIFEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets.json")
+CACHE_DIR = ".asset_cache"
+
+
+def display_format(surface):
+    # Before a display mode is set (tools, benchmarks) there's no format to
+    # convert to; the surface is returned as is
+    if pygame.display.get_surface() is None:
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+class AssetManager:
+    def __init__(self, manifest=MANIFEST_FILE, cache_dir=CACHE_DIR):
+        # Paths in the manifest are relative to it
+        self.root = os.path.dirname(os.path.abspath(manifest))
+        try:
+            with open(manifest) as f:
+                self.manifest = json.load(f)
+        except FileNotFoundError:
+            self.manifest = {}
+        self.cache_dir = cache_dir
+        self.loaded = {}  # name -> (kind, source, seconds, bytes)
+
+    def record(self, name, kind, source, start, size):
+        self.loaded[name] = (kind, source, time.perf_counter() - start, size)
+
+    # Sounds
+
+    def load_sounds(self):
+        # Every sound in the manifest that could be loaded, by name; needs
+        # pygame.mixer to be initialized. A missing or undecodable file is
+        # left out, so the caller can fall back to something else.
+        sounds = {}
+        for name, entry in self.manifest.get("sounds", {}).items():
+            start = time.perf_counter()
+            try:
+                sound, source, size = self.load_sound(name, entry)
+            except (OSError, pygame.error):
+                self.record(name, "sound", "missing", start, 0)
+                continue
+            sound.set_volume(entry.get("volume", 1.0))
+            sounds[name] = sound
+            self.record(name, "sound", source, start, size)
+        return sounds
+
+    def load_sound(self, name, entry):
+        path = os.path.join(self.root, entry["path"])
+        with open(path, 'rb') as f:
+            data = f.read()
+        mixer_format = pygame.mixer.get_init()
+        key = hashlib.sha256(data)
+        key.update(json.dumps([entry.get("start", 0), entry.get("duration"), mixer_format]).encode())
+        cache_path = os.path.join(self.cache_dir, f"{name}-{key.hexdigest()[:16]}.pcm")
+        try:
+            with open(cache_path, 'rb') as f:
+                pcm = f.read()
+            return pygame.mixer.Sound(buffer=pcm), "cache", len(pcm)
+        except FileNotFoundError:
+            pass
+
+        pcm = self.decode(path, entry, mixer_format)
+        self.store(name, cache_path, pcm)
+        return pygame.mixer.Sound(buffer=pcm), "decoded", len(pcm)
+
+    def decode(self, path, entry, mixer_format):
+        # The whole file in the mixer's format, cut down to the clip
+        sample_rate, sample_format, channels = mixer_format
+        frame_size = abs(sample_format) // 8 * channels
+        pcm = pygame.mixer.Sound(path).get_raw()
+        first = int(entry.get("start", 0) * sample_rate) * frame_size
+        duration = entry.get("duration")
+        last = len(pcm) if duration is None else first + int(duration * sample_rate) * frame_size
+        return pcm[first:last]
+
+    def store(self, name, cache_path, pcm):
+        # Written whole and renamed into place; clips of older versions of
+        # the file are dropped. A read-only install just decodes every time.
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{cache_path}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(pcm)
+            os.replace(tmp, cache_path)
+            for entry in os.listdir(self.cache_dir):
+                if entry.startswith(f"{name}-") and entry.endswith(".pcm"):
+                    stale = os.path.join(self.cache_dir, entry)
+                    if stale != cache_path:
+                        os.remove(stale)
+        except OSError:
+            pass
+
+    # Surfaces
+
+    def surface(self, name, build):
+        # Builds a surface the caller keeps, in the display's format; the
+        # latest build of each name is what gets reported
+        start = time.perf_counter()
+        surface = display_format(build())
+        self.record(name, "surface", "built", start, surface.get_pitch() * surface.get_height())
+        return surface
+
+    def report(self):
+        lines = [f"{'asset':16} {'kind':8} {'source':8} {'ms':>8} {'KiB':>9}"]
+        total = 0
+        for name, (kind, source, seconds, size) in sorted(list(self.loaded.items())):
+            lines.append(f"{name:16} {kind:8} {source:8} {seconds * 1000:8.2f} {size / 1024:9.1f}")
+            total += size
+        lines.append(f"{len(self.loaded)} assets, {total / 1024:.1f} KiB")
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the Modern Snake asset manifest and report on it")
+    parser.add_argument("--manifest", default=MANIFEST_FILE)
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="delete the decoded audio cache first, so every sound is decoded again")
+    args = parser.parse_args(argv)
+    assets = AssetManager(args.manifest)
+    if args.clear_cache and os.path.isdir(assets.cache_dir):
+        for entry in os.listdir(assets.cache_dir):
+            os.remove(os.path.join(assets.cache_dir, entry))
+    pygame.mixer.init()
+    assets.load_sounds()
+    print(assets.report())
+    print(f"mixer format {pygame.mixer.get_init()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
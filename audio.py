@@ -0,0 +1,132 @@
+import argparse
+import math
+import sys
+import time
+import wave
+
+import numpy as np
+import pygame
+
+# Sound effects synthesized in memory: each one is a single vectorized
+# NumPy pass straight into pygame.mixer.Sound(buffer=...), in whatever
+# format the mixer was opened with. Nothing is read from or written to
+# disk (`python audio.py --export DIR` writes WAV copies if you want them).
+#
+# Every effect owns a fixed set of reserved mixer channels (voices) and
+# plays round-robin over them: a new hit on a busy effect cuts off its
+# oldest voice instead of queueing, so a burst of eats at Master speed
+# never piles up or waits for a free channel.
+#
+# An effect with a recorded sample (the asset manifest's sounds, see
+# assets.py) plays that instead; the tone is the fallback when there's none.
+
+FADE = 0.005  # Seconds of fade in/out, so tones start and stop without a click
+EFFECTS = {
+    "eat": {"frequency": 880, "duration": 0.1, "volume": 0.3},
+    "crash": {"frequency": 220, "duration": 0.3, "volume": 0.4},
+}
+VOICES = {"eat": 3, "crash": 1}  # Reserved channels per effect
+
+# pygame.mixer.get_init() format -> (sample dtype, silence offset, peak)
+SAMPLE_FORMATS = {
+    -8: (np.int8, 0, 127),
+    8: (np.uint8, 128, 127),
+    -16: (np.int16, 0, 32767),
+    16: (np.uint16, 32768, 32767),
+    -32: (np.int32, 0, 2147483647),
+    32: (np.float32, 0, 1.0),
+}
+
+
+def synthesize(frequency, duration, volume, sample_rate, fade=FADE):
+    # One sine tone as floats in [-volume, volume]
+    count = int(sample_rate * duration)
+    t = np.arange(count) / sample_rate
+    samples = volume * np.sin(2 * math.pi * frequency * t)
+    ramp = min(int(sample_rate * fade), count // 2)
+    if ramp:
+        envelope = np.linspace(0.0, 1.0, ramp)
+        samples[:ramp] *= envelope
+        samples[count - ramp:] *= envelope[::-1]
+    return samples
+
+
+def to_buffer(samples, sample_format, channels):
+    # Float samples -> interleaved bytes in the mixer's format
+    dtype, offset, peak = SAMPLE_FORMATS[sample_format]
+    scaled = samples * peak + offset
+    if dtype is not np.float32:
+        scaled = np.rint(scaled)
+    data = scaled.astype(dtype)
+    if channels > 1:
+        data = np.repeat(data[:, None], channels, axis=1)
+    return data.tobytes()
+
+
+class AudioEngine:
+    # Needs pygame.mixer to be initialized
+    def __init__(self, effects=EFFECTS, voices=VOICES, samples=None):
+        self.sample_rate, self.sample_format, self.channel_count = pygame.mixer.get_init()
+        self.cache = {}  # (frequency, duration, volume, fade) -> Sound
+
+        total = sum(voices.get(name, 1) for name in effects)
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total))
+        pygame.mixer.set_reserved(total)  # Sound.play() elsewhere won't take them
+        self.voices = {}
+        self.next_voice = {}
+        first = 0
+        for name in effects:
+            count = voices.get(name, 1)
+            self.voices[name] = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+            self.next_voice[name] = 0
+            first += count
+        samples = samples or {}
+        self.effects = {name: samples[name] if name in samples else self.sound(**params)
+                        for name, params in effects.items()}
+
+    def sound(self, frequency, duration, volume, fade=FADE):
+        key = (frequency, duration, volume, fade)
+        sound = self.cache.get(key)
+        if sound is None:
+            samples = synthesize(frequency, duration, volume, self.sample_rate, fade)
+            sound = pygame.mixer.Sound(buffer=to_buffer(samples, self.sample_format,
+                                                        self.channel_count))
+            self.cache[key] = sound
+        return sound
+
+    def play(self, name):
+        voices = self.voices[name]
+        index = self.next_voice[name]
+        self.next_voice[name] = (index + 1) % len(voices)
+        voices[index].play(self.effects[name])
+
+
+def export(directory, sample_rate=44100):
+    # 16-bit mono WAV files of every effect, one write per file
+    for name, params in EFFECTS.items():
+        samples = synthesize(sample_rate=sample_rate, **params)
+        with wave.open(f"{directory}/{name}.wav", 'w') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(to_buffer(samples, -16, 1))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Modern Snake procedural sound effects")
+    parser.add_argument("--export", metavar="DIR", help="write every effect as a WAV file into DIR")
+    args = parser.parse_args(argv)
+    if args.export:
+        export(args.export)
+        print(f"Wrote {', '.join(EFFECTS)} to {args.export}")
+        return 0
+    pygame.mixer.init()
+    start = time.perf_counter()
+    AudioEngine()
+    print(f"Synthesized {len(EFFECTS)} effects in {(time.perf_counter() - start) * 1000:.2f} ms "
+          f"({pygame.mixer.get_init()})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
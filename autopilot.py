@@ -0,0 +1,338 @@
+import heapq
+import time
+from array import array
+from collections import deque
+
+from snake_engine import DIRECTIONS, OPPOSITE
+
+# Steering for a snake_engine.Snake, with no pygame dependency.
+#
+# Each plan is an A* search from the head to the food that knows when each
+# body cell will be vacated: the segment j cells from the head is still
+# there for the next len - j moves (longer while the snake is growing), so
+# a path may run through the tail end of the body. The path is kept and
+# followed tick after tick until the food moves or the path gets blocked,
+# so most ticks cost O(1).
+#
+# Every call gets `budget` seconds. A search that runs out commits to the
+# explored cell closest to the food and carries on from there next time
+# (real-time A*), so huge boards still make progress. Before a path is
+# taken, a flood fill from where it ends checks the snake won't be boxed
+# in. With no safe path it follows a Hamiltonian cycle of the board (when
+# one exists), else the move with the most room.
+#
+# How far each body cell is from the head comes from per-cell stamps, as
+# in world_view.py: every cell remembers the move on which the head last
+# entered it. Only the new head is stamped each tick, so no decision walks
+# the body (a new or reloaded snake is stamped once, in full).
+
+TICK_BUDGET = 0.002  # Seconds per decision; Master gives 40 ms per tick
+CHECK_EVERY = 16  # Expansions between clock reads
+OVERRUN_HOLD = 1.0  # Seconds the over-budget indicator stays lit
+
+
+class Autopilot:
+    def __init__(self, width, height, wall_collision=False, budget=TICK_BUDGET):
+        self.width = width
+        self.height = height
+        self.wall_collision = wall_collision
+        self.budget = budget
+        self.path = deque()  # Cells still to visit, next move first
+        self.target = None  # Food position the path was planned for
+        # A w x h grid has a Hamiltonian cycle when one side is even
+        self.transposed = height % 2 == 1
+        self.has_cycle = width > 1 and height > 1 and (width % 2 == 0 or height % 2 == 0)
+        self.over_budget = False  # The last decision ran out of time
+        self.overruns = 0
+        self.last_overrun = None
+        self.plans = 0
+        self.stamps = array('I', bytes(4 * width * height))
+        self.head_stamp = 0
+        self.snake = None  # Snake the stamps were made for
+        self.head = None
+
+    def recently_over_budget(self, now=None):
+        if self.last_overrun is None:
+            return False
+        now = time.perf_counter() if now is None else now
+        return now - self.last_overrun < OVERRUN_HOLD
+
+    def choose(self, snake, food):
+        # Returns the direction for the snake's next move
+        start = time.perf_counter()
+        deadline = start + self.budget
+        self.over_budget = False
+        self.sync(snake)
+        head = self.head
+
+        if (self.path and food == self.target and self.distance(head, self.path[0]) == 1
+                and not snake.occupancy[self.path[0]]):
+            step = self.path.popleft()
+        else:
+            # Half the budget for the search, a quarter for its safety check
+            # and the rest for the fallback
+            step = self.plan(snake, head, food, start + self.budget / 2,
+                             start + self.budget * 3 / 4)
+            if step is None:
+                step = self.fallback(snake, head, deadline)
+
+        if self.over_budget:
+            self.overruns += 1
+            self.last_overrun = time.perf_counter()
+        if step is None:
+            return snake.direction  # Boxed in: nothing is safe
+        return self.direction(head, step)
+
+    def sync(self, snake):
+        # Expects to be asked once per tick; any other change of head
+        # (another snake, a loaded game, skipped ticks) restamps the body
+        positions = snake.positions
+        width = self.width
+        head_x, head_y = positions[0]
+        head = head_y * width + head_x
+        if snake is self.snake and head == self.head:
+            return
+        if snake is self.snake and len(positions) > 1 and positions[1][1] * width + positions[1][0] == self.head:
+            self.head_stamp += 1
+            self.stamps[head] = self.head_stamp
+        else:
+            # Tail first, so a cell the body covers twice keeps its newer stamp
+            self.head_stamp = len(positions)
+            stamps = self.stamps
+            for i in range(len(positions) - 1, -1, -1):
+                x, y = positions[i]
+                stamps[y * width + x] = self.head_stamp - i
+            self.snake = snake
+        self.head = head
+
+    def direction(self, cell, step):
+        width = self.width
+        dx = step % width - cell % width
+        dy = step // width - cell // width
+        # Moves through a wrapping edge look like a jump across the board
+        if dx > 1:
+            dx = -1
+        elif dx < -1:
+            dx = 1
+        if dy > 1:
+            dy = -1
+        elif dy < -1:
+            dy = 1
+        return (dx, dy)
+
+    def neighbors(self, cell):
+        width = self.width
+        height = self.height
+        x = cell % width
+        y = cell // width
+        for dx, dy in DIRECTIONS:
+            nx = x + dx
+            ny = y + dy
+            if self.wall_collision:
+                if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                    continue
+            else:
+                nx %= width
+                ny %= height
+            yield ny * width + nx
+
+    def behind(self, snake, head):
+        # The cell straight behind the head; turning back into it is
+        # ignored by the engine even when it's free (a one-cell snake)
+        dx, dy = OPPOSITE[snake.direction]
+        x = (head % self.width + dx) % self.width
+        y = (head // self.width + dy) % self.height
+        return y * self.width + x
+
+    def distance(self, a, b):
+        width = self.width
+        dx = abs(a % width - b % width)
+        dy = abs(a // width - b // width)
+        if not self.wall_collision:
+            dx = min(dx, width - dx)
+            dy = min(dy, self.height - dy)
+        return dx + dy
+
+    def growth(self, snake):
+        # Segments still to be added before the tail starts moving again
+        return snake.pending_growth + (snake.grow_amount if snake.grow else 0)
+
+    def plan(self, snake, head, food, deadline, check_deadline):
+        # Returns the first cell of a new path, or None if there's no safe one
+        self.path.clear()
+        self.target = None
+        if food is None:
+            return None
+        self.plans += 1
+        goal = food[1] * self.width + food[0]
+
+        # Segment j of the body can be entered from move length - j + 1
+        # (later while the snake is growing)
+        vacated = len(snake.positions) + 1 + self.growth(snake)
+        occupancy = snake.occupancy
+        stamps = self.stamps
+        head_stamp = self.head_stamp
+
+        distance = self.distance
+        behind = self.behind(snake, head)
+        arrival = {head: 0}
+        came_from = {head: None}
+        # Ties go to the deeper node, which keeps A* from fanning out
+        # across open ground
+        frontier = [(distance(head, goal), 0, head)]
+        closest, closest_distance = head, distance(head, goal)
+        expansions = 0
+        found = False
+        while frontier:
+            _, moves, cell = heapq.heappop(frontier)
+            moves = -moves
+            if cell == goal:
+                found = True
+                break
+            if moves > arrival[cell]:
+                continue
+            expansions += 1
+            if expansions % CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                self.over_budget = True
+                break
+            moves += 1
+            for neighbor in self.neighbors(cell):
+                if moves == 1 and neighbor == behind:
+                    continue
+                if occupancy[neighbor] and vacated - (head_stamp - stamps[neighbor]) > moves:
+                    continue
+                if arrival.get(neighbor, moves + 1) <= moves:
+                    continue
+                arrival[neighbor] = moves
+                came_from[neighbor] = cell
+                remaining = distance(neighbor, goal)
+                heapq.heappush(frontier, (moves + remaining, -moves, neighbor))
+                if remaining < closest_distance:
+                    closest, closest_distance = neighbor, remaining
+
+        end = goal if found else closest
+        if end == head:
+            return None
+        path = []
+        while end != head:
+            path.append(end)
+            end = came_from[end]
+        path.reverse()
+        if not self.safe_after(snake, path, found, check_deadline):
+            return None
+        self.path.extend(path)
+        self.target = food
+        return self.path.popleft()
+
+    def safe_after(self, snake, path, eats, deadline):
+        # Where would the body be after following `path`, and can the head
+        # still reach its tail (or at least as many cells as it is long)?
+        # The body then is the path, newest first, followed by the first
+        # `keep` segments of the current body
+        positions = snake.positions
+        length = len(positions) + min(len(path), self.growth(snake))
+        body = path[::-1][:length]
+        keep = min(length - len(body), len(positions))
+        if keep:
+            x, y = positions[keep - 1]
+            tail = y * self.width + x
+        else:
+            tail = body[-1]
+        if eats:
+            length += snake.grow_amount
+        return self.room(snake, body[0], set(body), keep, length, deadline, tail=tail)
+
+    def room(self, snake, start, blocked, keep, needed, deadline, tail=None):
+        # Flood fill from `start` around `blocked` and the first `keep`
+        # segments of the body: True once `needed` cells are reachable or
+        # the tail is; False when the area runs out (or time does)
+        occupancy = snake.occupancy
+        stamps = self.stamps
+        head_stamp = self.head_stamp
+        seen = {start}
+        queue = deque([start])
+        count = 0
+        while queue:
+            cell = queue.popleft()
+            count += 1
+            if count >= needed:
+                return True
+            if count % CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                self.over_budget = True
+                return False
+            for neighbor in self.neighbors(cell):
+                if neighbor == tail and cell != start:
+                    return True
+                if neighbor in seen or neighbor in blocked:
+                    continue
+                if occupancy[neighbor] and head_stamp - stamps[neighbor] < keep:
+                    continue
+                seen.add(neighbor)
+                queue.append(neighbor)
+        return False
+
+    def cycle_next(self, cell):
+        # Next cell on a fixed Hamiltonian cycle: column 0 is the way back
+        # up, the other columns are swept row by row in a zigzag. With an
+        # odd height the same pattern runs on the transposed board.
+        width, height = self.width, self.height
+        x, y = cell % width, cell // width
+        if self.transposed:
+            x, y, width, height = y, x, height, width
+        if x == 0:
+            nx, ny = (0, y - 1) if y > 0 else (1, 0)
+        elif y % 2 == 0:
+            nx, ny = (x + 1, y) if x < width - 1 else (x, y + 1)
+        elif x > 1:
+            nx, ny = x - 1, y
+        else:
+            nx, ny = (x, y + 1) if y < height - 1 else (0, y)
+        if self.transposed:
+            nx, ny = ny, nx
+        return ny * self.width + nx
+
+    def fallback(self, snake, head, deadline):
+        occupancy = snake.occupancy
+        behind = self.behind(snake, head)
+        options = [cell for cell in self.neighbors(head) if not occupancy[cell] and cell != behind]
+        if not options:
+            return None
+        if time.perf_counter() > deadline:
+            # No time left to look ahead: any free cell, the cycle's first
+            self.over_budget = True
+            step = self.cycle_next(head) if self.has_cycle else None
+            return step if step in options else options[0]
+        # The whole body is in the way
+        length = len(snake.positions)
+        needed = length + self.growth(snake)
+        if self.has_cycle:
+            step = self.cycle_next(head)
+            if step in options and self.room(snake, step, (), length, needed, deadline):
+                return step
+
+        # Off the cycle: take the move with the most room (capped at what
+        # the snake needs), preferring to keep going straight
+        straight_x = (head % self.width + snake.direction[0]) % self.width
+        straight_y = (head // self.width + snake.direction[1]) % self.height
+        straight = straight_y * self.width + straight_x
+        best, best_room = None, -1
+        for step in options:
+            area = self.area(step, occupancy, needed, deadline)
+            if area > best_room or (area == best_room and step == straight):
+                best, best_room = step, area
+        return best
+
+    def area(self, start, occupancy, cap, deadline):
+        seen = {start}
+        queue = deque([start])
+        visited = 0
+        while queue and len(seen) < cap:
+            visited += 1
+            if visited % CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                self.over_budget = True
+                break
+            for neighbor in self.neighbors(queue.popleft()):
+                if neighbor not in seen and not occupancy[neighbor]:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        return len(seen)
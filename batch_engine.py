@@ -0,0 +1,160 @@
+import numpy as np
+
+from snake_engine import DIFFICULTY_FEATURES, DIRECTIONS, RIGHT
+
+# N independent games stepped together as NumPy arrays. The rules match
+# snake_engine.Snake/SnakeEngine; food placement uses NumPy's generator, so
+# individual games are reproducible from the seed but not identical to a
+# SnakeEngine game with the same seed.
+
+ACTIONS = DIRECTIONS
+NOOP = -1
+
+_DX = np.array([d[0] for d in ACTIONS], dtype=np.int32)
+_DY = np.array([d[1] for d in ACTIONS], dtype=np.int32)
+_OPPOSITE = np.array([ACTIONS.index((-d[0], -d[1])) for d in ACTIONS], dtype=np.int8)
+
+
+class BatchSnakeEngine:
+    def __init__(self, num_envs, width, height, difficulty="Medium",
+                 food_score=10, start=None, seed=None):
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.start = start if start is not None else (width // 2, height // 2)
+        self.rng = np.random.default_rng(seed)
+        self.envs = np.arange(num_envs)
+
+        # `difficulty` is a single name or one name per game
+        if isinstance(difficulty, str):
+            difficulty = [difficulty] * num_envs
+        features = [DIFFICULTY_FEATURES[name] for name in difficulty]
+        self.wall_collision = np.array([f["wall_collision"] for f in features], dtype=bool)
+        self.grow_amount = np.array([f["grow_amount"] for f in features], dtype=np.int32)
+        self.points = np.array([int(food_score * f["score_multiplier"]) for f in features],
+                               dtype=np.int64)
+        self.any_walls = bool(self.wall_collision.any())
+
+        # Bodies are ring buffers of cell ids (y * width + x); a snake can
+        # never be longer than the board, so that is the capacity.
+        cell_type = np.uint16 if self.size <= np.iinfo(np.uint16).max else np.int32
+        self.body = np.zeros((num_envs, self.size), dtype=cell_type)
+        self.head_index = np.zeros(num_envs, dtype=np.int64)
+        self.tail_index = np.zeros(num_envs, dtype=np.int64)
+        self.lengths = np.ones(num_envs, dtype=np.int64)
+        self.pending_growth = np.zeros(num_envs, dtype=np.int64)
+        self.occupancy = np.zeros((num_envs, self.size), dtype=np.uint8)
+        self.head_x = np.zeros(num_envs, dtype=np.int32)
+        self.head_y = np.zeros(num_envs, dtype=np.int32)
+        self.directions = np.zeros(num_envs, dtype=np.int8)
+        self.food = np.zeros(num_envs, dtype=np.int64)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+        self.ticks = np.zeros(num_envs, dtype=np.int64)
+        # Score and tick count of each game at the moment it last ended
+        self.final_scores = np.zeros(num_envs, dtype=np.int64)
+        self.final_ticks = np.zeros(num_envs, dtype=np.int64)
+        self.reset()
+
+    @property
+    def heads(self):
+        return self.head_y * self.width + self.head_x
+
+    def reset(self, mask=None):
+        envs = self.envs if mask is None else self.envs[mask]
+        if not len(envs):
+            return
+        start_x, start_y = self.start
+        start_cell = start_y * self.width + start_x
+        self.occupancy[envs] = 0
+        self.occupancy[envs, start_cell] = 1
+        self.body[envs, 0] = start_cell
+        self.head_index[envs] = 0
+        self.tail_index[envs] = 0
+        self.lengths[envs] = 1
+        self.pending_growth[envs] = 0
+        self.head_x[envs] = start_x
+        self.head_y[envs] = start_y
+        self.directions[envs] = ACTIONS.index(RIGHT)
+        self.scores[envs] = 0
+        self.ticks[envs] = 0
+        self.place_food(envs)
+
+    def place_food(self, envs):
+        # Try one uniform cell per game first; the few that hit the body
+        # (or every game on a crowded board) fall back to picking the k-th
+        # free cell of their occupancy row.
+        cells = self.rng.integers(0, self.size, size=len(envs))
+        taken = self.occupancy[envs, cells] != 0
+        if taken.any():
+            retry = envs[taken]
+            free = self.occupancy[retry] == 0
+            free_counts = free.sum(axis=1)
+            picks = (self.rng.random(len(retry)) * free_counts).astype(np.int64)
+            cells[taken] = np.argmax(np.cumsum(free, axis=1) > picks[:, None], axis=1)
+            # A full board has nowhere to put food; -1 never matches a head
+            cells[taken] = np.where(free_counts > 0, cells[taken], -1)
+        self.food[envs] = cells
+
+    def step(self, actions=None):
+        # `actions` holds an index into ACTIONS (or NOOP) per game. Returns
+        # the points scored this tick and a mask of games that ended; those
+        # games are reset in place and their results kept in final_scores.
+        envs = self.envs
+        if actions is not None:
+            actions = np.asarray(actions)
+            turn = (actions >= 0) & (actions != _OPPOSITE[self.directions])
+            self.directions = np.where(turn, actions, self.directions).astype(np.int8)
+
+        new_x = self.head_x + _DX[self.directions]
+        new_y = self.head_y + _DY[self.directions]
+        if self.any_walls:
+            dead = self.wall_collision & ((new_x < 0) | (new_x >= self.width) |
+                                          (new_y < 0) | (new_y >= self.height))
+        else:
+            dead = np.zeros(self.num_envs, dtype=bool)
+        new_x %= self.width
+        new_y %= self.height
+        cells = new_y * self.width + new_x
+
+        # Same rule as Snake.update: head and neck never count, the tail does
+        old_heads = self.body[envs, self.head_index].astype(np.int64)
+        necks = self.body[envs, (self.head_index - 1) % self.size].astype(np.int64)
+        occupied = self.occupancy[envs, cells].astype(np.int16)
+        occupied -= cells == old_heads
+        occupied -= (self.lengths > 1) & (cells == necks)
+        dead |= occupied > 0
+
+        alive = ~dead
+        moving = envs[alive]
+        cells = cells[alive]
+        self.head_x[alive] = new_x[alive]
+        self.head_y[alive] = new_y[alive]
+        self.head_index[moving] = (self.head_index[moving] + 1) % self.size
+        self.body[moving, self.head_index[moving]] = cells
+        self.occupancy[moving, cells] += 1
+        self.ticks[moving] += 1
+
+        growing = self.pending_growth[moving] > 0
+        grown = moving[growing]
+        self.pending_growth[grown] -= 1
+        self.lengths[grown] += 1
+        shrinking = moving[~growing]
+        tails = self.body[shrinking, self.tail_index[shrinking]]
+        self.occupancy[shrinking, tails] -= 1
+        self.tail_index[shrinking] = (self.tail_index[shrinking] + 1) % self.size
+
+        rewards = np.zeros(self.num_envs, dtype=np.int64)
+        ate = self.food[moving] == cells
+        if ate.any():
+            eaters = moving[ate]
+            rewards[eaters] = self.points[eaters]
+            self.scores[eaters] += self.points[eaters]
+            self.pending_growth[eaters] += self.grow_amount[eaters]
+            self.place_food(eaters)
+
+        if dead.any():
+            self.final_scores[dead] = self.scores[dead]
+            self.final_ticks[dead] = self.ticks[dead]
+            self.reset(dead)
+        return rewards, dead
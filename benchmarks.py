@@ -0,0 +1,232 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+
+# Run headless: no window and no sound card needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+import modern_snake  # noqa: E402  (needs the SDL drivers set first)
+from arena import Arena  # noqa: E402
+from snake_engine import Food, Snake  # noqa: E402
+
+DEFAULT_OUTPUT = "benchmark_results.json"
+DEFAULT_TOLERANCE = 0.25  # Allowed slowdown against the baseline (25%)
+BENCHMARKS = []
+
+
+class BenchmarkFailed(Exception):
+    # Raised by a timed callable whose run didn't work; the benchmark is
+    # reported as failed and the rest still run
+    pass
+
+
+def benchmark(name, number):
+    # Register a benchmark: the decorated function does the setup and
+    # returns the callable to time `number` times per run
+    def register(setup):
+        BENCHMARKS.append((name, setup, number))
+        return setup
+    return register
+
+
+def make_game():
+    game = modern_snake.ModernGame()
+    game.frame_dt = 1 / modern_snake.RENDER_FPS
+    return game
+
+
+def snake_update(length):
+    # A one-row wrapping board twice the snake's length: the snake circles
+    # forever without ever reaching its own tail
+    width = length * 2
+    snake = Snake(width, 1, start=(length - 1, 0))
+    snake.load_positions([(x, 0) for x in range(length - 1, -1, -1)])
+    return snake.update
+
+
+for _length in (10, 1000, 10000):
+    benchmark(f"snake_update_len_{_length}", 20000)(lambda length=_length: snake_update(length))
+
+
+def food_placement(fill):
+    width = height = 100
+    snake = Snake(width, height, start=(0, 0))
+    cells = int(width * height * fill) or 1
+    snake.load_positions([(cell % width, cell // width) for cell in range(cells)])
+    food = Food(width, height)
+    return lambda: food.randomize_position(snake)
+
+
+for _fill in (0.0, 0.5, 0.9, 0.99):
+    benchmark(f"food_placement_fill_{int(_fill * 100)}", 20000)(
+        lambda fill=_fill: food_placement(fill))
+
+
+def arena_tick(snakes):
+    # One tick of the multiplayer arena; the cost should grow linearly
+    # with the snake count, never quadratically
+    arena = Arena(seed=0)
+    for _ in range(snakes):
+        arena.add_snake()
+    return arena.step
+
+
+for _snakes in (10, 100, 400):
+    benchmark(f"arena_tick_{_snakes}_snakes", 2000)(lambda snakes=_snakes: arena_tick(snakes))
+
+
+@benchmark("gameplay_frame", 200)
+def gameplay_frame():
+    game = make_game()
+    game.state = "game"
+    snake = game.snake
+    snake.load_positions([(x, y) for y in range(4) for x in range(25)])
+
+    def frame():
+        game.draw_grid()
+        game.draw_sidebar()
+        snake.render(game.screen)
+        game.food.render(game.screen)
+    return frame
+
+
+@benchmark("menu_frame", 200)
+def menu_frame():
+    game = make_game()
+    return game.draw_menu
+
+
+@benchmark("high_scores_load", 200)
+def high_scores_load():
+    game = make_game()
+    return game.load_high_scores
+
+
+@benchmark("high_scores_record", 200)
+def high_scores_record():
+    # Ever higher scores, so every call appends (and fsyncs) a log line
+    game = make_game()
+    scores = itertools.count(1)
+
+    def record():
+        game.score = next(scores)
+        game.record_high_score()
+    return record
+
+
+@benchmark("startup_to_menu", 3)
+def startup_to_menu():
+    # A whole cold launch: interpreter, imports, first menu frame and the
+    # background loads, as measured by the game's own --startup-report.
+    # Runs in the working directory like everything else, so its score and
+    # asset cache files land there rather than in the checkout.
+    command = [sys.executable, os.path.join(ROOT, "modern_snake.py"), "--startup-report"]
+
+    def launch():
+        status = subprocess.run(command, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL).returncode
+        if status:
+            # 1 is the report's own verdict: first frame over budget
+            raise BenchmarkFailed(f"--startup-report exited with status {status}")
+    return launch
+
+
+def run(selected=None, repeat=5):
+    results = {}
+    for name, setup, number in BENCHMARKS:
+        if selected and name not in selected:
+            continue
+        timer = timeit.Timer(setup())
+        try:
+            runs = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+        except BenchmarkFailed as e:
+            results[name] = {"failed": str(e)}
+            print(f"{name:32} FAILED: {e}")
+            continue
+        results[name] = {
+            "best_us": min(runs) * 1e6,
+            "mean_us": sum(runs) / len(runs) * 1e6,
+            "iterations": number * repeat,
+        }
+        print(f"{name:32} best {results[name]['best_us']:10.2f} us"
+              f"   mean {results[name]['mean_us']:10.2f} us")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # Compare best-of-N times; returns the names that got slower than allowed
+    regressions = []
+    for name, result in results.items():
+        if "failed" in result:
+            continue  # Already counted as a failure
+        if "best_us" not in baseline.get(name, {}):
+            print(f"{name:32} (no baseline)")
+            continue
+        before = baseline[name]["best_us"]
+        ratio = result["best_us"] / before if before else 1.0
+        status = "REGRESSION" if ratio > 1 + tolerance else "ok"
+        print(f"{name:32} {before:10.2f} -> {result['best_us']:10.2f} us  x{ratio:5.2f}  {status}")
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Modern Snake performance benchmarks")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT,
+                        help="where to write the JSON results")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a benchmark fails (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("names", nargs="*", help="only run these benchmarks")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    output = os.path.abspath(args.output)
+
+    # The game reads and writes its files relative to the working directory
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            results = run(args.names, args.repeat)
+        finally:
+            os.chdir(cwd)
+
+    with open(output, "w") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+    status = 0
+    failed = [name for name, result in results.items() if "failed" in result]
+    if failed:
+        print(f"{len(failed)} benchmark(s) failed: {', '.join(failed)}")
+        status = 1
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
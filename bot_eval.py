@@ -0,0 +1,230 @@
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from autopilot import Autopilot
+from snake_engine import DIFFICULTY_FEATURES, DIRECTIONS, OPPOSITE, SnakeEngine
+
+# Plays many headless games per strategy and difficulty across all cores.
+# Every game is a pure function of its job (strategy, difficulty, seed and
+# board), so a seed set always gives the same results however the games
+# are spread over processes. Results stream to a JSON-lines file in job
+# order; re-running the same command skips the games already in it.
+
+DEFAULT_WIDTH = 32  # ModernGame's board
+DEFAULT_HEIGHT = 30
+DEFAULT_OUTPUT = "bot_eval.jsonl"
+CHUNK_SIZE = 16  # Games handed to a worker at a time
+# What a game depends on; a stored result is only reused for the same job
+JOB_FIELDS = ("strategy", "difficulty", "seed", "width", "height", "max_ticks")
+
+
+def autopilot_bot(engine, seed):
+    # No time budget: every decision runs to completion, so it doesn't
+    # depend on how busy the machine is
+    autopilot = Autopilot(engine.width, engine.height, engine.wall_collision, budget=math.inf)
+    return lambda: autopilot.choose(engine.snake, engine.food.position)
+
+
+def safe_moves(engine):
+    snake = engine.snake
+    head_x, head_y = snake.positions[0]
+    moves = []
+    for dx, dy in DIRECTIONS:
+        x, y = head_x + dx, head_y + dy
+        if engine.wall_collision and not (0 <= x < engine.width and 0 <= y < engine.height):
+            continue
+        x %= engine.width
+        y %= engine.height
+        if not snake.occupancy[y * engine.width + x]:
+            moves.append(((dx, dy), x, y))
+    return moves
+
+
+def greedy_bot(engine, seed):
+    # Any free neighbour that gets closer to the food, ignoring wrapping
+    def choose():
+        food = engine.food.position
+        moves = safe_moves(engine)
+        if not moves or food is None:
+            return None
+        return min(moves, key=lambda move: abs(move[1] - food[0]) + abs(move[2] - food[1]))[0]
+    return choose
+
+
+def random_bot(engine, seed):
+    rng = random.Random(seed)
+
+    def choose():
+        moves = safe_moves(engine)
+        return rng.choice(moves)[0] if moves else None
+    return choose
+
+
+STRATEGIES = {
+    "autopilot": autopilot_bot,
+    "greedy": greedy_bot,
+    "random": random_bot,
+}
+
+
+def death_cause(engine):
+    # Called after the crash: where would the head have gone?
+    snake = engine.snake
+    x = snake.positions[0][0] + snake.direction[0]
+    y = snake.positions[0][1] + snake.direction[1]
+    if engine.wall_collision and not (0 <= x < engine.width and 0 <= y < engine.height):
+        return "wall"
+    return "self"
+
+
+def play(job):
+    strategy, difficulty, seed, width, height, max_ticks = job
+    engine = SnakeEngine.for_difficulty(difficulty, width, height, seed=seed)
+    choose = STRATEGIES[strategy](engine, seed)
+    cause = "timeout"
+    while engine.ticks < max_ticks:
+        if engine.food.position is None:
+            cause = "board_full"
+            break
+        direction = choose()
+        if direction == OPPOSITE.get(engine.snake.direction):
+            direction = None
+        if not engine.step(direction):
+            cause = death_cause(engine)
+            break
+    return {
+        "strategy": strategy, "difficulty": difficulty, "seed": seed,
+        "width": width, "height": height, "max_ticks": max_ticks,
+        "score": engine.score, "length": len(engine.snake.positions),
+        "ticks": engine.ticks, "cause": cause,
+    }
+
+
+def job_key(job):
+    # `job` is a job tuple, or a result (results from before the board
+    # size was stored have no match, so those games are played again)
+    if isinstance(job, dict):
+        job = tuple(job.get(field) for field in JOB_FIELDS)
+    return "/".join(map(str, job))
+
+
+def load_done(path):
+    # Results already on disk, keyed by job. A line cut short by an
+    # interrupted run is dropped by rewriting the file without it.
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, 'rb') as f:
+        lines = f.read().split(b"\n")
+    valid = []
+    for line in lines:
+        try:
+            result = json.loads(line)
+        except ValueError:
+            continue
+        done[job_key(result)] = result
+        valid.append(line)
+    if len(valid) != len([line for line in lines if line]):
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(b"".join(line + b"\n" for line in valid))
+        os.replace(tmp, path)
+    return done
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def summarize(results):
+    groups = {}
+    for result in results:
+        groups.setdefault((result["strategy"], result["difficulty"]), []).append(result)
+    summary = {}
+    for (strategy, difficulty), games in sorted(groups.items()):
+        scores = sorted(game["score"] for game in games)
+        causes = {}
+        for game in games:
+            causes[game["cause"]] = causes.get(game["cause"], 0) + 1
+        summary[f"{strategy}/{difficulty}"] = {
+            "games": len(games),
+            "score_mean": sum(scores) / len(scores),
+            "score_p10": percentile(scores, 0.10),
+            "score_p50": percentile(scores, 0.50),
+            "score_p90": percentile(scores, 0.90),
+            "score_max": scores[-1],
+            "length_mean": sum(game["length"] for game in games) / len(games),
+            "ticks_mean": sum(game["ticks"] for game in games) / len(games),
+            "causes": causes,
+        }
+    return summary
+
+
+def print_summary(summary):
+    print(f"{'strategy/difficulty':24} {'games':>6} {'mean':>8} {'p10':>6} {'p50':>6} "
+          f"{'p90':>6} {'max':>6} {'ticks':>8}  causes")
+    for name, row in summary.items():
+        causes = " ".join(f"{cause}={count}" for cause, count in sorted(row["causes"].items()))
+        print(f"{name:24} {row['games']:6} {row['score_mean']:8.1f} {row['score_p10']:6} "
+              f"{row['score_p50']:6} {row['score_p90']:6} {row['score_max']:6} "
+              f"{row['ticks_mean']:8.0f}  {causes}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate Modern Snake bots over many seeded games")
+    parser.add_argument("--strategy", nargs="+", default=["autopilot"], choices=sorted(STRATEGIES))
+    parser.add_argument("--difficulty", nargs="+", default=list(DIFFICULTY_FEATURES),
+                        choices=list(DIFFICULTY_FEATURES))
+    parser.add_argument("--games", type=int, default=1000, help="games per strategy and difficulty")
+    parser.add_argument("--seed", type=int, default=0, help="first seed; games use seed..seed+games-1")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT)
+    parser.add_argument("--max-ticks", type=int,
+                        help="stop a game after this many ticks (default 20 per board cell)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT,
+                        help="JSON-lines results; existing results are kept and skipped")
+    parser.add_argument("--summary", help="also write the aggregate table as JSON")
+    args = parser.parse_args(argv)
+
+    max_ticks = args.max_ticks or 20 * args.width * args.height
+    done = load_done(args.output)
+    jobs = [(strategy, difficulty, seed, args.width, args.height, max_ticks)
+            for strategy in args.strategy
+            for difficulty in args.difficulty
+            for seed in range(args.seed, args.seed + args.games)]
+    todo = [job for job in jobs if job_key(job) not in done]
+    print(f"{len(jobs)} games, {len(jobs) - len(todo)} already done, "
+          f"{len(todo)} to play on {args.workers} workers")
+
+    start = time.perf_counter()
+    if todo:
+        with open(args.output, 'a') as out, Pool(args.workers) as pool:
+            # imap keeps job order, so the file doesn't depend on scheduling
+            for count, result in enumerate(pool.imap(play, todo, chunksize=CHUNK_SIZE), 1):
+                out.write(json.dumps(result) + "\n")
+                done[job_key(result)] = result
+                if count % CHUNK_SIZE == 0 or count == len(todo):
+                    out.flush()
+                    elapsed = time.perf_counter() - start
+                    print(f"\r{count}/{len(todo)} games  {count / elapsed:.0f} games/s",
+                          end="", flush=True)
+        print()
+
+    results = [done[job_key(job)] for job in jobs]
+    summary = summarize(results)
+    print_summary(summary)
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
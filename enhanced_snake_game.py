@@ -1,9 +1,8 @@
 import pygame
-import random
 import sys
-import json
-from pathlib import Path
-import os
+from audio import AudioEngine
+from score_store import ScoreStore
+from snake_engine import Food as EngineFood, Snake as EngineSnake, SnakeEngine
 
 # Initialize Pygame and its mixer
 pygame.init()
@@ -39,52 +38,24 @@ COLOR_THEMES = {
     "Forest": {"snake": (34, 139, 34), "food": (139, 69, 19), "background": (0, 100, 0)},
 }
 
-class Snake:
+class Snake(EngineSnake):
     def __init__(self, color):
-        self.positions = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-        self.direction = (1, 0)
-        self.grow = False
+        super().__init__(GRID_WIDTH, GRID_HEIGHT)
         self.color = color
 
-    def get_head_position(self):
-        return self.positions[0]
-
-    def update(self):
-        current = self.get_head_position()
-        x, y = self.direction
-        new = ((current[0] + x) % GRID_WIDTH, (current[1] + y) % GRID_HEIGHT)
-        
-        if new in self.positions[2:]:
-            return False
-        
-        self.positions.insert(0, new)
-        if not self.grow:
-            self.positions.pop()
-        else:
-            self.grow = False
-        return True
-
-    def reset(self):
-        self.positions = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-        self.direction = (1, 0)
-        self.grow = False
-
     def render(self, surface):
         for p in self.positions:
             pygame.draw.rect(surface, self.color, 
                            (p[0] * GRID_SIZE, p[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
 
-class Food:
+class Food(EngineFood):
     def __init__(self, color):
-        self.position = (0, 0)
+        super().__init__(GRID_WIDTH, GRID_HEIGHT)
         self.color = color
-        self.randomize_position()
-
-    def randomize_position(self):
-        self.position = (random.randint(0, GRID_WIDTH - 1),
-                        random.randint(0, GRID_HEIGHT - 1))
 
     def render(self, surface):
+        if self.position is None:  # Board is full
+            return
         pygame.draw.rect(surface, self.color,
                         (self.position[0] * GRID_SIZE, 
                          self.position[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
@@ -113,7 +84,10 @@ class Game:
         self.font = pygame.font.Font(None, 36)
         
         # Load high scores
-        self.high_scores_file = "high_scores.json"
+        # The old shared high_scores.json held both games' bests; only
+        # this game's difficulties are taken from it
+        self.score_store = ScoreStore("enhanced_high_scores", legacy_path="high_scores.json",
+                                      legacy_difficulties=DIFFICULTY_SPEEDS)
         self.load_high_scores()
         
         # Load sounds
@@ -130,15 +104,12 @@ class Game:
         self.reset_game()
 
     def load_sounds(self):
-        # Create sounds directory if it doesn't exist
-        sounds_dir = Path("sounds")
-        sounds_dir.mkdir(exist_ok=True)
-        
-        # Initialize sound effects (you'll need to provide actual sound files)
-        self.sounds = {
-            "eat": pygame.mixer.Sound("sounds/eat.wav") if os.path.exists("sounds/eat.wav") else None,
-            "crash": pygame.mixer.Sound("sounds/crash.wav") if os.path.exists("sounds/crash.wav") else None
-        }
+        # Synthesized in memory; silent when there's no audio device
+        self.audio = AudioEngine() if pygame.mixer.get_init() else None
+
+    def play_sound(self, name):
+        if self.audio:
+            self.audio.play(name)
 
     def create_buttons(self):
         self.menu_buttons = {
@@ -148,25 +119,21 @@ class Game:
         }
 
     def load_high_scores(self):
-        try:
-            with open(self.high_scores_file, 'r') as f:
-                self.high_scores = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.high_scores = {"Easy": 0, "Medium": 0, "Hard": 0}
-
-    def save_high_scores(self):
-        with open(self.high_scores_file, 'w') as f:
-            json.dump(self.high_scores, f)
+        self.high_scores = {difficulty: self.score_store.best(difficulty)
+                            for difficulty in DIFFICULTY_SPEEDS}
 
     def reset_game(self):
         theme = COLOR_THEMES[self.current_theme]
         self.snake = Snake(theme["snake"])
         self.food = Food(theme["food"])
+        self.engine = SnakeEngine(GRID_WIDTH, GRID_HEIGHT, food_score=1,
+                                  snake=self.snake, food=self.food)
         self.score = 0
         self.background_color = theme["background"]
 
     def handle_menu_click(self, pos):
         if self.menu_buttons["start"].is_clicked(pos):
+            self.reset_game()
             self.state = "game"
         elif self.menu_buttons["difficulty"].is_clicked(pos):
             difficulties = list(DIFFICULTY_SPEEDS.keys())
@@ -236,22 +203,17 @@ class Game:
             
             elif self.state == "game":
                 # Update snake position
-                if not self.snake.update():
-                    if self.sounds["crash"]:
-                        self.sounds["crash"].play()
-                    if self.score > self.high_scores[self.current_difficulty]:
-                        self.high_scores[self.current_difficulty] = self.score
-                        self.save_high_scores()
+                if not self.engine.step():
+                    self.play_sound("crash")
+                    if self.score_store.record(self.current_difficulty, self.score):
+                        self.load_high_scores()
                     self.state = "game_over"
                     continue
 
                 # Check for food collision
-                if self.snake.get_head_position() == self.food.position:
-                    if self.sounds["eat"]:
-                        self.sounds["eat"].play()
-                    self.snake.grow = True
-                    self.food.randomize_position()
-                    self.score += 1
+                if self.engine.ate:
+                    self.play_sound("eat")
+                    self.score = self.engine.score
 
                 # Draw everything
                 self.screen.fill(self.background_color)
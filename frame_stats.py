@@ -0,0 +1,135 @@
+import csv
+import json
+import time
+from array import array
+
+PHASES = ("events", "widgets", "simulation", "draw", "present", "frame")
+HISTORY = 600  # Frames kept per phase (10 seconds at 60 FPS)
+STARTUP_BUDGET = 0.5  # Seconds from launch to the first menu frame
+
+
+def summarize(samples, filled):
+    # Mean and percentiles, in milliseconds, of the first `filled` samples
+    # (seconds) in a ring buffer; zeros while it's empty
+    values = sorted(samples[:filled])
+    if not values:
+        return dict.fromkeys(("mean", "p50", "p95", "p99", "max"), 0.0)
+    return {
+        "mean": sum(values) / filled * 1000,
+        "p50": values[int(filled * 0.50)] * 1000,
+        "p95": values[min(int(filled * 0.95), filled - 1)] * 1000,
+        "p99": values[min(int(filled * 0.99), filled - 1)] * 1000,
+        "max": values[-1] * 1000,
+    }
+
+
+class FrameProfiler:
+    # Times each phase of the game loop into fixed-size ring buffers. While
+    # disabled every call returns straight away, so leaving the hooks in
+    # the loop costs next to nothing.
+    def __init__(self, enabled=False, history=HISTORY):
+        self.history = history
+        self.samples = {phase: array('d', bytes(8 * history)) for phase in PHASES}
+        self.count = 0
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = self.last = time.perf_counter()
+        self.partial = False  # Enabled partway through the current frame
+        self._enabled = enabled
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled):
+        # Switched on mid-frame (F3 is handled in the events phase), the
+        # timestamps are stale and the frame's earlier phases went unseen:
+        # start timing from now and drop the rest of this frame
+        if enabled and not self._enabled:
+            self.frame_start = self.last = time.perf_counter()
+            self.current = dict.fromkeys(PHASES, 0.0)
+            self.partial = True
+        self._enabled = enabled
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.partial = False
+        self.frame_start = self.last = time.perf_counter()
+
+    def mark(self, phase):
+        # Charge the time since the previous mark to `phase`
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        current = self.current
+        if self.partial:
+            self.partial = False
+            for phase in current:
+                current[phase] = 0.0
+            return
+        current["frame"] = time.perf_counter() - self.frame_start
+        slot = self.count % self.history
+        for phase, seconds in current.items():
+            self.samples[phase][slot] = seconds
+            current[phase] = 0.0
+        self.count += 1
+
+    def stats(self):
+        # Milliseconds per phase over the frames still in the buffers
+        filled = min(self.count, self.history)
+        return {phase: summarize(self.samples[phase], filled) for phase in PHASES}
+
+    def export(self, path):
+        # JSON for *.json paths, CSV (one row per phase) otherwise
+        stats = self.stats()
+        frames = min(self.count, self.history)
+        if path.endswith(".json"):
+            with open(path, 'w') as f:
+                json.dump({"frames": frames, "unit": "ms", "phases": stats}, f, indent=2)
+            return
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["phase", "frames", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+            for phase, values in stats.items():
+                writer.writerow([phase, frames] + [f"{values[key]:.4f}" for key in
+                                                   ("mean", "p50", "p95", "p99", "max")])
+
+
+class StartupTimer:
+    # Wall-clock milestones from launch (`start`) to the first frame and
+    # the background loads after it, for --startup-report
+    def __init__(self, start=None, budget=STARTUP_BUDGET):
+        self.start = time.perf_counter() if start is None else start
+        self.budget = budget
+        self.marks = {}
+
+    def mark(self, name):
+        # Only the first time a milestone is reached counts
+        self.marks.setdefault(name, time.perf_counter() - self.start)
+
+    def first_frame(self):
+        return self.marks.get("first frame")
+
+    def within_budget(self):
+        first_frame = self.first_frame()
+        return first_frame is not None and first_frame <= self.budget
+
+    def report(self):
+        lines = []
+        previous = 0.0
+        for name, seconds in sorted(self.marks.items(), key=lambda mark: mark[1]):
+            lines.append(f"{name:16} {seconds * 1000:8.1f} ms  (+{(seconds - previous) * 1000:.1f})")
+            previous = seconds
+        first_frame = self.first_frame()
+        if first_frame is not None:
+            verdict = "within" if self.within_budget() else "OVER"
+            lines.append(f"time to first frame {first_frame * 1000:.1f} ms, {verdict} the "
+                         f"{self.budget * 1000:.0f} ms budget")
+        return "\n".join(lines)
@@ -0,0 +1,93 @@
+import time
+from array import array
+from collections import deque
+
+from frame_stats import summarize
+from snake_engine import OPPOSITE
+
+# Turn input between the render loop and the simulation. Keys are polled
+# every rendered frame, whatever the tick rate, and each turn is queued
+# with the time it was seen. Every tick takes at most one turn off the
+# front, so two presses inside one tick (UP then LEFT while going right)
+# become two consecutive turns instead of the second overwriting the
+# first. Turns are checked against the direction before them: a turn
+# that repeats it or reverses into the body is never queued or applied.
+#
+# With measuring on, the queue also records how long each turn took from
+# being seen to moving the snake (the tick that applied it) and to being
+# on screen (the next present). The time before the poll saw the key, at
+# most one frame, isn't included.
+
+TURN_QUEUE_SIZE = 3  # Turns held ahead of the simulation; more are dropped
+LATENCY_HISTORY = 256  # Latency samples kept per measurement
+
+
+class TurnQueue:
+    def __init__(self, capacity=TURN_QUEUE_SIZE, measure=False, history=LATENCY_HISTORY):
+        self.capacity = capacity
+        self.turns = deque()  # (direction, seen at), oldest first
+        self.dropped = 0  # Turns refused because the queue was full
+
+        self.measure = measure
+        self.history = history
+        self.samples = {name: array('d', bytes(8 * history)) for name in ("tick", "present")}
+        self.counts = dict.fromkeys(self.samples, 0)
+        self.moved = []  # Seen-at times of turns applied since the last present
+
+    def __len__(self):
+        return len(self.turns)
+
+    def clear(self):
+        self.turns.clear()
+        self.moved.clear()
+
+    def push(self, direction, current, seen=None):
+        # `current` is the direction the snake is moving in; returns
+        # whether the turn was queued
+        last = self.turns[-1][0] if self.turns else current
+        if direction == last or direction == OPPOSITE[last]:
+            return False
+        if len(self.turns) == self.capacity:
+            self.dropped += 1
+            return False
+        self.turns.append((direction, time.perf_counter() if seen is None else seen))
+        return True
+
+    def pop(self, current):
+        # The turn for this tick, or None to keep going. Checked again
+        # against what was applied last, which the autopilot or a loaded
+        # game may have changed since the turn was queued.
+        while self.turns:
+            direction, seen = self.turns.popleft()
+            if direction != current and direction != OPPOSITE[current]:
+                if self.measure:
+                    self.record("tick", time.perf_counter() - seen)
+                    self.moved.append(seen)
+                return direction
+        return None
+
+    def presented(self):
+        # Call right after the frame is on screen
+        if self.moved:
+            now = time.perf_counter()
+            for seen in self.moved:
+                self.record("present", now - seen)
+            self.moved.clear()
+
+    def record(self, name, seconds):
+        self.samples[name][self.counts[name] % self.history] = seconds
+        self.counts[name] += 1
+
+    def stats(self):
+        # Milliseconds from a key being seen to the move, per measurement
+        return {name: dict(summarize(samples, min(self.counts[name], self.history)),
+                           turns=self.counts[name])
+                for name, samples in self.samples.items()}
+
+    def report(self):
+        lines = []
+        for name, values in self.stats().items():
+            lines.append(f"key to {name:8} {values['turns']:6} turns  p50 {values['p50']:6.1f} ms  "
+                         f"p95 {values['p95']:6.1f} ms  max {values['max']:6.1f} ms")
+        lines.append(f"{self.dropped} turns dropped (queue of {self.capacity})")
+        return "\n".join(lines)
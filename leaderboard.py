@@ -0,0 +1,242 @@
+import argparse
+import asyncio
+import json
+import queue
+import socket
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+from score_store import TOP_K, ScoreStore
+
+# A venue-wide leaderboard shared by every cabinet on the network.
+# Protocol: newline-delimited JSON over one long-lived TCP connection per
+# client; requests may be pipelined and are answered in order.
+#   {"op": "submit", "difficulty": "Medium", "score": 120}
+#       -> {"ok": true, "rank": 3}          (rank is null outside the top-K)
+#   {"op": "top", "difficulty": "Medium", "k": 10}
+#       -> {"ok": true, "scores": [540, 320, ...]}
+# Failures answer {"ok": false, "error": "..."} and keep the connection.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_STORE = "venue_scores"
+FLUSH_INTERVAL = 0.5  # Seconds between batched writes to the score store
+FLUSH_BATCH = 512  # Flush early once this many scores are waiting
+CLIENT_QUEUE = 256  # Requests a game keeps while the server is unreachable
+RECONNECT_DELAY = 2.0
+
+
+def parse_address(address):
+    host, _, port = address.rpartition(":")
+    return host or DEFAULT_HOST, int(port)
+
+
+class Leaderboard:
+    # Ordered top-K index per difficulty: ascending lists kept sorted with
+    # bisect, so a submit costs O(log K + K) and a top query O(k)
+    def __init__(self, top_k=TOP_K):
+        self.top_k = top_k
+        self.boards = {}
+
+    def add(self, difficulty, score):
+        # Returns the 1-based rank, or None if the score missed the board
+        board = self.boards.setdefault(difficulty, [])
+        index = bisect_left(board, score)
+        if len(board) == self.top_k:
+            if index == 0:
+                return None
+            board.pop(0)
+            index -= 1
+        board.insert(index, score)
+        return len(board) - index
+
+    def top(self, difficulty, k=None):
+        board = self.boards.get(difficulty, [])
+        k = self.top_k if k is None else min(k, self.top_k)
+        return board[:-k - 1:-1] if k > 0 else []
+
+
+class LeaderboardServer:
+    # Answers from the in-memory index straight away; scores that made a
+    # board are queued and written to the ScoreStore in batches on a
+    # worker thread, so the event loop never waits on fsync.
+    def __init__(self, store_path=DEFAULT_STORE, top_k=TOP_K,
+                 flush_interval=FLUSH_INTERVAL, flush_batch=FLUSH_BATCH):
+        self.store = ScoreStore(store_path, top_k=top_k)
+        self.index = Leaderboard(top_k)
+        for difficulty in self.store.boards:
+            for score in reversed(self.store.top(difficulty)):
+                self.index.add(difficulty, score)
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.pending = []
+        self.submissions = 0
+        self.server = None
+        self.flusher = None
+        self.flush_now = None
+        self.flush_lock = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.flush_now = asyncio.Event()
+        self.flush_lock = asyncio.Lock()
+        self.flusher = asyncio.create_task(self.flush_loop())
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.flusher.cancel()
+        try:
+            await self.flusher
+        except asyncio.CancelledError:
+            pass
+        await self.flush()
+
+    async def flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.flush_now.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.flush_now.clear()
+            # Cancelling can't stop a write already on the worker thread, so
+            # it isn't cancelled at all: close() waits for it instead
+            await asyncio.shield(self.flush())
+
+    async def flush(self):
+        # One batch at a time: the store isn't safe to write from two
+        # threads (its file lock only keeps other processes out)
+        async with self.flush_lock:
+            if not self.pending:
+                return
+            batch, self.pending = self.pending, []
+            await asyncio.get_running_loop().run_in_executor(None, self.store.record_many, batch)
+
+    def handle(self, request):
+        op = request.get("op")
+        difficulty = request.get("difficulty")
+        if not isinstance(difficulty, str):
+            raise ValueError("difficulty must be a string")
+        if op == "submit":
+            score = request.get("score")
+            if not isinstance(score, int) or score < 0:
+                raise ValueError("score must be a non-negative integer")
+            self.submissions += 1
+            rank = self.index.add(difficulty, score) if score else None
+            if rank is not None:
+                self.pending.append((difficulty, score))
+                if len(self.pending) >= self.flush_batch:
+                    self.flush_now.set()
+            return {"ok": True, "rank": rank}
+        if op == "top":
+            k = request.get("k")
+            if k is not None and not isinstance(k, int):
+                raise ValueError("k must be an integer")
+            return {"ok": True, "scores": self.index.top(difficulty, k)}
+        raise ValueError(f"unknown op {op!r}")
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = self.handle(json.loads(line))
+                except (ValueError, AttributeError) as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+class LeaderboardClient:
+    # Game-side client. submit() and request_top() only queue the request;
+    # a daemon thread owns the connection, reconnects after failures and
+    # keeps `bests` (difficulty -> venue best) up to date. The frame loop
+    # never touches the network. Requests beyond CLIENT_QUEUE are dropped
+    # (the local ScoreStore still has the score). A submit is sent at most
+    # once: if the connection fails after it went out, the server may have
+    # recorded it, so it's given up rather than risk counting it twice.
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.address = (host, port)
+        self.requests = queue.Queue(CLIENT_QUEUE)
+        self.bests = {}
+        self.thread = threading.Thread(target=self.run, name="leaderboard", daemon=True)
+        self.thread.start()
+
+    def submit(self, difficulty, score):
+        self.send({"op": "submit", "difficulty": difficulty, "score": score})
+        self.request_top(difficulty)
+
+    def request_top(self, difficulty):
+        self.send({"op": "top", "difficulty": difficulty, "k": 1})
+
+    def send(self, request):
+        try:
+            self.requests.put_nowait(request)
+        except queue.Full:
+            pass
+
+    def best(self, difficulty):
+        return self.bests.get(difficulty, 0)
+
+    def run(self):
+        sock = stream = None
+        request = None
+        while True:
+            if request is None:
+                request = self.requests.get()
+            sent = False
+            try:
+                if sock is None:
+                    sock = socket.create_connection(self.address, timeout=5)
+                    stream = sock.makefile('rb')
+                sock.sendall(json.dumps(request).encode() + b"\n")
+                sent = True
+                response = json.loads(stream.readline())
+            except (OSError, ValueError):
+                if sock is not None:
+                    sock.close()
+                sock = stream = None
+                if sent and request["op"] == "submit":
+                    request = None
+                time.sleep(RECONNECT_DELAY)
+                continue
+            if request["op"] == "top" and response.get("ok"):
+                scores = response["scores"]
+                self.bests[request["difficulty"]] = scores[0] if scores else 0
+            request = None
+
+
+async def serve(host, port, store_path):
+    server = LeaderboardServer(store_path)
+    host, port = await server.start(host, port)
+    print(f"Leaderboard listening on {host}:{port} (scores in {store_path}.json)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Venue-wide Modern Snake leaderboard server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--store", default=DEFAULT_STORE,
+                        help="score store path prefix (.json/.log/.lock are added)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.store))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from leaderboard import DEFAULT_HOST, LeaderboardServer, parse_address
+from snake_engine import DIFFICULTY_FEATURES
+
+# Hammers a leaderboard server with score submissions over persistent,
+# pipelined connections and reports the sustained rate. Without --server
+# it starts a throwaway in-process server backed by a temporary store.
+
+DIFFICULTIES = list(DIFFICULTY_FEATURES)
+
+
+async def submitter(host, port, count, window, rng):
+    # One connection: keeps up to `window` requests in flight
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = received = 0
+    while received < count:
+        burst = min(window - (sent - received), count - sent)
+        for _ in range(burst):
+            request = {"op": "submit", "difficulty": rng.choice(DIFFICULTIES),
+                       "score": rng.randrange(10, 100000, 10)}
+            writer.write(json.dumps(request).encode() + b"\n")
+        sent += burst
+        await writer.drain()
+        while received < sent:
+            response = json.loads(await reader.readline())
+            if not response["ok"]:
+                raise RuntimeError(response["error"])
+            received += 1
+    writer.close()
+    await writer.wait_closed()
+
+
+async def query_latency(host, port, samples=200):
+    reader, writer = await asyncio.open_connection(host, port)
+    timings = []
+    for i in range(samples):
+        start = time.perf_counter()
+        writer.write(json.dumps({"op": "top", "difficulty": DIFFICULTIES[i % len(DIFFICULTIES)]})
+                     .encode() + b"\n")
+        await writer.drain()
+        await reader.readline()
+        timings.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+
+async def load_test(args):
+    if args.server:
+        await run_load(args, *parse_address(args.server))
+        return
+    with tempfile.TemporaryDirectory() as workdir:
+        server = LeaderboardServer(os.path.join(workdir, "loadtest_scores"))
+        host, port = await server.start(DEFAULT_HOST, 0)
+        try:
+            await run_load(args, host, port)
+        finally:
+            await server.close()
+            server.store.close()
+        print(f"stored {sum(len(b) for b in server.store.boards.values())} leaderboard entries")
+
+
+async def run_load(args, host, port):
+    rng = random.Random(args.seed)
+    per_connection = args.submissions // args.connections
+    total = per_connection * args.connections
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        submitter(host, port, per_connection, args.window, random.Random(rng.getrandbits(32)))
+        for _ in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - start
+    p50, p99 = await query_latency(host, port)
+
+    print(f"{total} submissions over {args.connections} connections in {elapsed:.2f} s")
+    print(f"{total / elapsed:,.0f} submissions/s")
+    print(f"top query latency p50 {p50 * 1000:.2f} ms  p99 {p99 * 1000:.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the leaderboard server")
+    parser.add_argument("--server", metavar="HOST:PORT",
+                        help="server to test (default: start one in-process)")
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--submissions", type=int, default=50000,
+                        help="total submissions across all connections")
+    parser.add_argument("--window", type=int, default=64,
+                        help="requests in flight per connection")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    asyncio.run(load_test(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,17 +1,27 @@
+import time
+STARTUP_START = time.perf_counter()  # Startup is timed from here, imports included
 import pygame
 import random
 import sys
-import json
-import os
 import math
-from pygame import gfxdraw
-import pygame_widgets
-from pygame_widgets.button import Button as WidgetButton
-import time
-
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
+import struct
+import argparse
+import threading
+from assets import AssetManager, display_format
+from audio import AudioEngine
+from autopilot import Autopilot
+from frame_stats import PHASES, FrameProfiler, StartupTimer
+from input_queue import TurnQueue
+from particles import ParticleField
+from replay import MAGIC as REPLAY_MAGIC, Replay, ReplayRecorder
+from score_store import ScoreStore
+from snake_engine import DIFFICULTY_FEATURES, DOWN, LEFT, RIGHT, UP, Food, GameState, Snake, SnakeEngine
+from text_cache import TextCache
+from world_view import WorldView
+
+# Nothing is initialized at import: ModernGame starts only the pygame
+# subsystems it needs. Modules only some launches use (pygame_widgets, the
+# asyncio-based network clients) are imported where they're first needed.
 
 # Constants
 WINDOW_WIDTH = 1024
@@ -20,6 +30,23 @@ GRID_SIZE = 25
 GRID_WIDTH = (WINDOW_WIDTH - 200) // GRID_SIZE  # Gameplay area width
 GRID_HEIGHT = WINDOW_HEIGHT // GRID_SIZE
 
+# Frame pacing: the simulation ticks at the difficulty speed while input and
+# rendering run at RENDER_FPS (0 means uncapped)
+RENDER_FPS = 60
+MAX_TICKS_PER_FRAME = 5  # Catch-up limit so a slow frame can't snowball
+ANIMATION_FPS = 12  # Frame rate the menu and food animations were tuned at
+PARTICLE_COUNT = 50  # Menu background particles
+SEGMENT_GRADIENT_STEPS = 16  # Shades between the snake's head and tail
+LAST_REPLAY_FILE = "last_replay.snkr"
+SAVE_FILE = "saved_game.snks"
+HIGH_SCORES_FILE = "high_scores"  # ScoreStore adds .json/.log/.lock
+LEGACY_HIGH_SCORES_FILE = "high_scores.json"
+HUD_REFRESH = 0.25  # Seconds between performance HUD updates
+ATTRACT_RESTART = 2.0  # Seconds attract mode shows a finished game before restarting
+KEY_DIRECTIONS = {pygame.K_UP: UP, pygame.K_DOWN: DOWN, pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT}
+MINIMAP_POSITION = (20, WINDOW_HEIGHT - 260)  # Sidebar spot for the large-world minimap
+COLOR_STEPS = 6  # Levels per half wave for animated text colours, so the text cache holds them all
+
 # Modern Color Palette
 COLORS = {
     'background': (18, 18, 18),
@@ -36,6 +63,15 @@ COLORS = {
     'gradient2': (142, 68, 173),  # Purple
 }
 
+MINIMAP_COLORS = {
+    'background': COLORS['background'],
+    'grid': COLORS['grid'],
+    'snake': COLORS['accent3'],
+    'head': COLORS['text'],
+    'food': COLORS['accent2'],
+    'frame': COLORS['accent1'],
+}
+
 # Game settings
 DIFFICULTY_SPEEDS = {
     "Beginner": 6,
@@ -46,151 +82,204 @@ DIFFICULTY_SPEEDS = {
     "Master": 25
 }
 
-DIFFICULTY_FEATURES = {
-    "Beginner": {
-        "speed": 6,
-        "score_multiplier": 1,
-        "grow_amount": 1,
-        "wall_collision": False,  # Can pass through walls
-        "description": "Perfect for beginners!"
-    },
-    "Easy": {
-        "speed": 8,
-        "score_multiplier": 1.2,
-        "grow_amount": 1,
-        "wall_collision": False,
-        "description": "A gentle challenge"
-    },
-    "Medium": {
-        "speed": 12,
-        "score_multiplier": 1.5,
-        "grow_amount": 1,
-        "wall_collision": False,
-        "description": "The classic experience"
-    },
-    "Hard": {
-        "speed": 16,
-        "score_multiplier": 2,
-        "grow_amount": 2,
-        "wall_collision": True,  # Die on wall collision
-        "description": "For skilled players"
-    },
-    "Expert": {
-        "speed": 20,
-        "score_multiplier": 2.5,
-        "grow_amount": 2,
-        "wall_collision": True,
-        "description": "A true challenge"
-    },
-    "Master": {
-        "speed": 25,
-        "score_multiplier": 3,
-        "grow_amount": 3,
-        "wall_collision": True,
-        "description": "Only for the best!"
-    }
-}
+def wave(phase, steps=COLOR_STEPS):
+    # sin(phase) snapped to one of 2 * steps + 1 levels
+    return round(math.sin(phase) * steps) / steps
 
-class ModernSnake:
-    def __init__(self, color):
-        self.positions = [(GRID_WIDTH // 4, GRID_HEIGHT // 2)]
-        self.direction = (1, 0)
-        self.grow = False
-        self.color = color
-        self.length = 1
-        self.grow_amount = 1
 
-    def get_head_position(self):
-        return self.positions[0]
+class SegmentAtlas:
+    # Rounded snake segments pre-rendered side by side, one per gradient
+    # step from full colour at the head to half transparent at the tail
+    def __init__(self, color, steps=SEGMENT_GRADIENT_STEPS):
+        size = GRID_SIZE - 4
+        self.surface = pygame.Surface((size * steps, size), pygame.SRCALPHA)
+        self.areas = []
+        for step in range(steps):
+            alpha = int(255 * (1 - step / steps * 0.5))
+            area = pygame.Rect(step * size, 0, size, size)
+            pygame.draw.rect(self.surface, (*color, alpha), area, border_radius=5)
+            self.areas.append(area)
+        self.surface = display_format(self.surface)
 
-    def update(self, wall_collision=False):
-        current = self.get_head_position()
-        x, y = self.direction
-        new_x = current[0] + x
-        new_y = current[1] + y
-        
-        # Handle wall collision based on difficulty
-        if wall_collision:
-            if new_x < 0 or new_x >= GRID_WIDTH or new_y < 0 or new_y >= GRID_HEIGHT:
-                return False
-            new = (new_x, new_y)
-        else:
-            new = (new_x % GRID_WIDTH, new_y % GRID_HEIGHT)
-        
-        if new in self.positions[2:]:
-            return False
-        
-        self.positions.insert(0, new)
-        if not self.grow:
-            self.positions.pop()
-        else:
-            # Add multiple segments based on grow_amount
-            self.grow = False
-            self.length += self.grow_amount
-        return True
 
-    def render(self, surface):
-        for i, p in enumerate(self.positions):
-            # Calculate alpha value for gradient effect
-            alpha = int(255 * (1 - i / len(self.positions) * 0.5))
-            color = list(self.color) + [alpha]
-            
-            # Draw rounded rectangle for each segment
-            x = p[0] * GRID_SIZE + 200  # Offset for sidebar
-            y = p[1] * GRID_SIZE
-            rect = pygame.Rect(x + 2, y + 2, GRID_SIZE - 4, GRID_SIZE - 4)
-            
-            # Draw segment with rounded corners
-            pygame.draw.rect(surface, color, rect, border_radius=5)
+class ModernSnake(Snake):
+    atlases = {}  # SegmentAtlas per colour, shared by every snake
 
-class ModernFood:
-    def __init__(self, color):
-        self.position = (0, 0)
+    def __init__(self, color, width=GRID_WIDTH, height=GRID_HEIGHT):
+        super().__init__(width, height, start=(width // 4, height // 2))
         self.color = color
-        self.randomize_position()
-        self.pulse = 0
 
-    def randomize_position(self):
-        self.position = (random.randint(0, GRID_WIDTH - 1),
-                        random.randint(0, GRID_HEIGHT - 1))
+    @property
+    def atlas(self):
+        if self.color not in self.atlases:
+            self.atlases[self.color] = SegmentAtlas(self.color)
+        return self.atlases[self.color]
+
+    def render(self, surface, previous=None, blend=1.0, gradient=True):
+        # With the positions from the previous tick, segments are drawn
+        # `blend` of the way from there to where they are now
+        positions = self.positions
+        if previous and blend < 1.0:
+            last = len(previous) - 1
+            positions = [self.interpolate(previous[min(i, last)], p, blend)
+                         for i, p in enumerate(positions)]
+
+        # Map each segment to a gradient step by its place in the body
+        atlas = self.atlas
+        steps = len(atlas.areas) if gradient else 1
+        length = len(self.positions)
+        surface.blits(
+            [(atlas.surface, self.segment_position(p), atlas.areas[i * steps // length])
+             for i, p in enumerate(positions)],
+            doreturn=False
+        )
+
+    @staticmethod
+    def interpolate(start, end, blend):
+        # Segments that wrapped around the board snap instead of sliding
+        if abs(end[0] - start[0]) + abs(end[1] - start[1]) != 1:
+            return end
+        return (start[0] + (end[0] - start[0]) * blend,
+                start[1] + (end[1] - start[1]) * blend)
+
+    @staticmethod
+    def segment_position(p):
+        # Top-left of a segment inset 2px in its cell, offset for the sidebar
+        return (round(p[0] * GRID_SIZE) + 202, round(p[1] * GRID_SIZE) + 2)
+
+    def render_segment(self, surface, p, step=0):
+        atlas = self.atlas
+        surface.blit(atlas.surface, self.segment_position(p), atlas.areas[step])
+
+class ModernFood(Food):
+    def __init__(self, color, width=GRID_WIDTH, height=GRID_HEIGHT):
+        super().__init__(width, height)
+        self.color = color
+        self.pulse = 0
 
-    def render(self, surface):
+    def animate(self, dt):
         # Pulsing animation
-        self.pulse = (self.pulse + 0.1) % (2 * math.pi)
+        self.pulse = (self.pulse + 0.1 * ANIMATION_FPS * dt) % (2 * math.pi)
+
+    def render(self, surface, cell_origin=None):
+        # `cell_origin` is the screen position of the food's cell when a
+        # camera decides where that is
+        if self.position is None:  # Board is full
+            return
         size = int(GRID_SIZE * (0.6 + math.sin(self.pulse) * 0.1))
+        if cell_origin is None:
+            cell_origin = (self.position[0] * GRID_SIZE + 200, self.position[1] * GRID_SIZE)
         
-        x = self.position[0] * GRID_SIZE + 200 + (GRID_SIZE - size) // 2
-        y = self.position[1] * GRID_SIZE + (GRID_SIZE - size) // 2
+        x = cell_origin[0] + (GRID_SIZE - size) // 2
+        y = cell_origin[1] + (GRID_SIZE - size) // 2
         
         # Draw food with glow effect
         pygame.draw.circle(surface, (*self.color, 100), (x + size//2, y + size//2), size//2 + 4)
         pygame.draw.circle(surface, self.color, (x + size//2, y + size//2), size//2)
 
+def widgets():
+    import pygame_widgets.button
+    return pygame_widgets
+
+
 class ModernGame:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, dirty_rects=False, render_fps=RENDER_FPS, perf_stats_path=None,
+                 leaderboard=None, autopilot=False, attract=False, world_size=None,
+                 spectate=None, startup_report=False, input_latency=False):
+        self.startup = StartupTimer(STARTUP_START)
+        self.startup.mark("imports")
+        self.startup_report = startup_report
+
+        # Just the display and fonts; the mixer starts on the asset loader
+        # thread once the first frame is up
+        pygame.display.init()
+        pygame.font.init()
         pygame.display.set_caption("Modern Snake")
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.startup.mark("window")
         self.clock = pygame.time.Clock()
+        self.render_fps = render_fps
+        self.frame_dt = 0.0
         self.title_font = pygame.font.Font(None, 100)
         self.subtitle_font = pygame.font.Font(None, 36)
         self.info_font = pygame.font.Font(None, 24)
+        self.hud_font = pygame.font.Font(None, 18)
+        self.text_cache = TextCache()
+        self.startup.mark("fonts")
+
+        # Sounds from the asset manifest, and the load time and size of
+        # everything it and the cached layers hold (--startup-report)
+        self.assets = AssetManager()
+
+        # Frame phase timings; only recorded while the HUD is up (F3) or
+        # when they are exported on exit
+        self.perf_stats_path = perf_stats_path
+        self.profiler = FrameProfiler(enabled=perf_stats_path is not None)
+        self.show_perf_hud = False
+        self.hud_layer = None
+        self.hud_updated = 0.0
         
         self.state = "menu"
         self.paused = False
         self.current_difficulty = "Medium"
         self.difficulty_info = DIFFICULTY_FEATURES[self.current_difficulty]
-        self.setup_buttons()
+        self.invalidate_layers()
+
+        # Board size; a world bigger than the window is viewed through a
+        # camera that follows the head, with a minimap in the sidebar
+        self.board_width, self.board_height = world_size or (GRID_WIDTH, GRID_HEIGHT)
+        self.world_size = world_size
+        self.world_view = None
+
+        # Opt-in dirty-rectangle rendering: steady gameplay frames only
+        # redraw and present the cells that changed since the last frame.
+        # A scrolling world changes every cell, so it always redraws.
+        self.dirty_rects = dirty_rects and world_size is None
+        self.dirty_cells = set()
+        self.presented_state = None
+
+        # Autopilot steers every game while enabled; attract mode starts
+        # straight into an autopiloted game and restarts it after each death
+        self.autopilot_enabled = autopilot or attract
+        self.attract = attract
+        self.restart_timer = 0.0
+
+        # Arrow keys are queued as they're polled each frame and the game
+        # takes one turn per tick (see input_queue.py); with input_latency
+        # the key-to-move times are printed on exit
+        self.turns = TurnQueue(measure=input_latency)
+
+        # Live stream for spectators ("host:port" to listen on): a keyframe
+        # whenever a game starts, then a small delta per tick
+        self.streamer = None
+        if spectate:
+            from leaderboard import parse_address
+            from spectator import StateStreamer
+            self.streamer = StateStreamer(*parse_address(spectate))
+
+        # Menu buttons are made after the first frame: pygame_widgets looks
+        # up a system font, which can mean scanning every font installed
+        self.buttons = {}
         self.reset_game()
+        if attract:
+            self.state = "game"
         
-        # Load sounds
-        self.load_sounds()
-        
-        # Load high scores
-        self.load_high_scores()
+        # Sound effects and high scores are set up by a background thread
+        # started after the first frame; until then the game is silent and
+        # the boards show zeros. With a venue leaderboard ("host:port") the
+        # bests shown are the higher of this machine's and the venue's.
+        self.audio = None
+        self.high_scores = dict.fromkeys(DIFFICULTY_FEATURES, 0)
+        self.score_store = None
+        self.loader = None
+        self.leaderboard = None
+        if leaderboard:
+            from leaderboard import LeaderboardClient, parse_address
+            self.leaderboard = LeaderboardClient(*parse_address(leaderboard))
+            for difficulty in DIFFICULTY_FEATURES:
+                self.leaderboard.request_top(difficulty)
         
         # Menu animations
-        self.particles = []
         self.create_particles()
         
         # Demo snake for menu
@@ -203,42 +292,16 @@ class ModernGame:
         # Color animation
         self.color_time = 0
         self.color_speed = 0.001
+        self.startup.mark("game setup")
 
     def create_particles(self):
-        for _ in range(50):
-            x = random.randint(0, WINDOW_WIDTH)
-            y = random.randint(0, WINDOW_HEIGHT)
-            speed = random.uniform(0.5, 2)
-            size = random.randint(2, 5)
-            self.particles.append({
-                'pos': [x, y],
-                'speed': speed,
-                'size': size,
-                'angle': random.uniform(0, math.pi * 2)
-            })
+        self.particles = ParticleField(PARTICLE_COUNT, WINDOW_WIDTH, WINDOW_HEIGHT, COLORS['accent1'])
 
     def update_particles(self):
-        for particle in self.particles:
-            particle['pos'][0] += math.cos(particle['angle']) * particle['speed']
-            particle['pos'][1] += math.sin(particle['angle']) * particle['speed']
-            
-            # Wrap around screen
-            if particle['pos'][0] < 0:
-                particle['pos'][0] = WINDOW_WIDTH
-            elif particle['pos'][0] > WINDOW_WIDTH:
-                particle['pos'][0] = 0
-            if particle['pos'][1] < 0:
-                particle['pos'][1] = WINDOW_HEIGHT
-            elif particle['pos'][1] > WINDOW_HEIGHT:
-                particle['pos'][1] = 0
+        self.particles.update(self.frame_dt * ANIMATION_FPS)
 
     def draw_particles(self):
-        for particle in self.particles:
-            alpha = int(128 + 127 * math.sin(time.time() * 2 + particle['pos'][0] * 0.01))
-            color = (*COLORS['accent1'][:3], alpha)
-            particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surface, color, (particle['size'], particle['size']), particle['size'])
-            self.screen.blit(particle_surface, (particle['pos'][0] - particle['size'], particle['pos'][1] - particle['size']))
+        self.particles.draw(self.screen, time.time())
 
     def setup_buttons(self):
         btn_width = 240
@@ -247,8 +310,9 @@ class ModernGame:
         start_y = WINDOW_HEIGHT // 2 + 30
         spacing = 70
 
+        Button = widgets().button.Button
         self.buttons = {
-            'start': WidgetButton(
+            'start': Button(
                 self.screen, center_x, start_y, btn_width, btn_height,
                 text='Start Game',
                 fontSize=28,
@@ -259,7 +323,7 @@ class ModernGame:
                 radius=25,
                 onClick=lambda: setattr(self, 'state', 'game')
             ),
-            'difficulty': WidgetButton(
+            'difficulty': Button(
                 self.screen, center_x, start_y + spacing, btn_width, btn_height,
                 text=f'Difficulty: {self.current_difficulty}',
                 fontSize=28,
@@ -271,17 +335,36 @@ class ModernGame:
             )
         }
 
+    def update_difficulty_button(self):
+        if not self.buttons:
+            return  # Not made yet; they'll show the current difficulty
+        # Update button text
+        self.buttons['difficulty'] = widgets().button.Button(
+            self.screen, 
+            self.buttons['difficulty'].getX(),
+            self.buttons['difficulty'].getY(),
+            self.buttons['difficulty'].getWidth(),
+            self.buttons['difficulty'].getHeight(),
+            text=f'Difficulty: {self.current_difficulty}',
+            fontSize=28,
+            margin=20,
+            inactiveColour=(*COLORS['button'][:3], 200),
+            hoverColour=COLORS['button_hover'],
+            pressedColour=COLORS['accent1'],
+            radius=25
+        )
+
     def draw_menu(self):
         # Draw animated background
         self.update_particles()
         self.draw_particles()
         
         # Update color animation
-        self.color_time += self.color_speed
+        self.color_time += self.color_speed * self.frame_dt * ANIMATION_FPS
         glow_color = (
-            int(127 + 127 * math.sin(self.color_time)),
-            int(127 + 127 * math.sin(self.color_time + 2)),
-            int(127 + 127 * math.sin(self.color_time + 4))
+            int(127 + 127 * wave(self.color_time)),
+            int(127 + 127 * wave(self.color_time + 2)),
+            int(127 + 127 * wave(self.color_time + 4))
         )
         
         # Draw title with glow effect
@@ -290,13 +373,13 @@ class ModernGame:
         
         # Draw glow
         for offset in range(10, 0, -2):
-            glow_surface = self.title_font.render(title_text, True, (*glow_color, 25))
+            glow_surface = self.text_cache.render(self.title_font, title_text, True, (*glow_color, 25))
             glow_pos = (WINDOW_WIDTH//2 - glow_surface.get_width()//2 + offset,
                        WINDOW_HEIGHT//4 - glow_surface.get_height()//2 + wave_offset + offset)
             self.screen.blit(glow_surface, glow_pos)
         
         # Draw main title
-        title = self.title_font.render(title_text, True, COLORS['text'])
+        title = self.text_cache.render(self.title_font, title_text, True, COLORS['text'])
         title_pos = (WINDOW_WIDTH//2 - title.get_width()//2,
                     WINDOW_HEIGHT//4 - title.get_height()//2 + wave_offset)
         self.screen.blit(title, title_pos)
@@ -304,14 +387,14 @@ class ModernGame:
         # Draw subtitle with fade effect
         alpha = int(128 + 127 * math.sin(time.time() * 2))
         subtitle_surface = pygame.Surface((400, 40), pygame.SRCALPHA)
-        subtitle = self.subtitle_font.render('Use arrow keys to control', True, (*COLORS['accent1'][:3], alpha))
+        subtitle = self.text_cache.render(self.subtitle_font, 'Use arrow keys to control', True, (*COLORS['accent1'][:3], alpha))
         subtitle_pos = (200 - subtitle.get_width()//2, 0)
         subtitle_surface.blit(subtitle, subtitle_pos)
         self.screen.blit(subtitle_surface, (WINDOW_WIDTH//2 - 200, WINDOW_HEIGHT//4 + 60))
         
         # Draw difficulty description with fade effect
         desc_surface = pygame.Surface((400, 40), pygame.SRCALPHA)
-        desc = self.subtitle_font.render(self.difficulty_info["description"], True, (*COLORS['accent4'][:3], alpha))
+        desc = self.text_cache.render(self.subtitle_font, self.difficulty_info["description"], True, (*COLORS['accent4'][:3], alpha))
         desc_pos = (200 - desc.get_width()//2, 0)
         desc_surface.blit(desc, desc_pos)
         self.screen.blit(desc_surface, (WINDOW_WIDTH//2 - 200, WINDOW_HEIGHT - 60))
@@ -330,7 +413,7 @@ class ModernGame:
         pygame.draw.rect(panel, (*COLORS['panel'][:3], 200), (0, 0, panel_width, panel_height), border_radius=15)
         
         # Draw title
-        title = self.subtitle_font.render('High Scores', True, COLORS['text'])
+        title = self.text_cache.render(self.subtitle_font, 'High Scores', True, COLORS['text'])
         panel.blit(title, (panel_width//2 - title.get_width()//2, 10))
         
         # Draw scores
@@ -342,79 +425,335 @@ class ModernGame:
             color = (
                 int(255 * (1 - color_ratio)),
                 int(255 * color_ratio),
-                int(128 + 127 * math.sin(time.time() + color_index))
+                int(128 + 127 * wave(time.time() + color_index))
             )
             
-            text = self.info_font.render(f'{difficulty}: {score}', True, color)
+            text = self.text_cache.render(self.info_font, f'{difficulty}: {score}', True, color)
             panel.blit(text, (20, y_offset))
             y_offset += 25
         
         self.screen.blit(panel, (panel_x, panel_y))
 
     def load_high_scores(self):
-        try:
-            with open("high_scores.json", 'r') as f:
-                self.high_scores = json.load(f)
-                # Ensure all difficulties exist in high scores
-                for difficulty in DIFFICULTY_FEATURES.keys():
-                    if difficulty not in self.high_scores:
-                        self.high_scores[difficulty] = 0
-        except:
-            # Initialize high scores for all difficulties
-            self.high_scores = {diff: 0 for diff in DIFFICULTY_FEATURES.keys()}
-            self.save_high_scores()
-
-    def save_high_scores(self):
-        with open("high_scores.json", 'w') as f:
-            json.dump(self.high_scores, f)
+        # Best score per difficulty, including games other instances on
+        # this machine finished since the last call
+        if self.score_store is None:
+            self.score_store = ScoreStore(HIGH_SCORES_FILE, legacy_path=LEGACY_HIGH_SCORES_FILE)
+        else:
+            self.score_store.refresh()
+        self.high_scores = {diff: self.score_store.best(diff) for diff in DIFFICULTY_FEATURES}
+        if self.leaderboard:
+            for diff in DIFFICULTY_FEATURES:
+                self.high_scores[diff] = max(self.high_scores[diff], self.leaderboard.best(diff))
+
+    def record_high_score(self):
+        self.wait_for_assets()
+        if self.leaderboard and self.score > 0:
+            # Only queued here; the client thread does the network I/O
+            self.leaderboard.submit(self.current_difficulty, self.score)
+        if self.score_store.record(self.current_difficulty, self.score):
+            best = self.score_store.best(self.current_difficulty)
+            self.high_scores[self.current_difficulty] = max(
+                best, self.high_scores[self.current_difficulty])
 
     def load_sounds(self):
-        self.sounds = {
-            "eat": pygame.mixer.Sound("sounds/eat.wav") if os.path.exists("sounds/eat.wav") else None,
-            "crash": pygame.mixer.Sound("sounds/crash.wav") if os.path.exists("sounds/crash.wav") else None
-        }
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            return  # No audio device: play on silently
+        self.audio = AudioEngine(samples=self.assets.load_sounds())
+
+    def play_sound(self, name):
+        if self.audio:
+            self.audio.play(name)
+
+    def start_loading_assets(self):
+        self.loader = threading.Thread(target=self.load_assets, name="assets", daemon=True)
+        self.loader.start()
+
+    def load_assets(self):
+        self.load_sounds()
+        self.startup.mark("sounds")
+        self.load_high_scores()
+        self.startup.mark("high scores")
+
+    def wait_for_assets(self):
+        # The score store must be loaded before anything records or
+        # refreshes it on this thread
+        if self.loader is not None:
+            self.loader.join()
+        elif self.score_store is None:
+            self.load_assets()  # Never started (no run loop): load now
 
     def reset_game(self):
-        self.snake = ModernSnake(COLORS['accent3'])
-        self.food = ModernFood(COLORS['accent2'])
+        self.snake = ModernSnake(COLORS['accent3'], self.board_width, self.board_height)
+        self.food = ModernFood(COLORS['accent2'], self.board_width, self.board_height)
         self.score = 0
         self.game_over = False
+        self.presented_state = None
+        self.tick_accumulator = 0.0
+        self.previous_positions = None
+        self.turns.clear()
         self.difficulty_info = DIFFICULTY_FEATURES[self.current_difficulty]
-        self.snake.grow_amount = self.difficulty_info["grow_amount"]
+        # Every game gets its own seed so it can be replayed exactly
+        self.seed = random.getrandbits(32)
+        self.engine = SnakeEngine.for_difficulty(
+            self.current_difficulty, self.board_width, self.board_height,
+            snake=self.snake, food=self.food, seed=self.seed
+        )
+        self.recorder = ReplayRecorder(self.seed, self.current_difficulty,
+                                       self.board_width, self.board_height, self.snake.start)
+        self.autopilot = (Autopilot(self.board_width, self.board_height, self.engine.wall_collision)
+                          if self.autopilot_enabled else None)
+        self.autopilot_used = False
+        self.restart_timer = 0.0
+        if self.world_size:
+            self.world_view = WorldView(
+                self.board_width, self.board_height,
+                pygame.Rect(200, 0, GRID_WIDTH * GRID_SIZE, GRID_HEIGHT * GRID_SIZE), GRID_SIZE,
+                wrap=not self.engine.wall_collision, colors=MINIMAP_COLORS)
+            self.world_view.reset(self.snake)
+        if self.streamer:
+            self.streamer.keyframe(self.engine)
+
+    def save_game(self):
+        # The replay so far rides along so it keeps recording after a resume,
+        # behind one byte saying whether the autopilot has played this game
+        state = self.engine.snapshot()
+        state.extra = bytes([self.autopilot_used]) + self.recorder.replay.to_bytes()
+        state.save(SAVE_FILE)
+
+    def load_game(self):
+        try:
+            state = GameState.load(SAVE_FILE)
+        except (OSError, ValueError, struct.error):
+            return
+        if (state.width, state.height) != (self.board_width, self.board_height):
+            return  # Saved on a different board size
+        self.current_difficulty = state.difficulty
+        self.update_difficulty_button()
+        self.reset_game()
+        self.engine = SnakeEngine.from_state(state, snake=self.snake, food=self.food)
+        if self.world_view:
+            self.world_view.reset(self.snake)
+        if self.streamer:
+            self.streamer.keyframe(self.engine)
+        self.seed = state.seed
+        self.score = state.score
+        if state.extra:
+            replay = state.extra
+            if not replay.startswith(REPLAY_MAGIC):  # Older saves hold just the replay
+                self.autopilot_used, replay = bool(replay[0]), replay[1:]
+            self.recorder.replay = Replay.from_bytes(replay)
+        # Resume paused so the player can get their bearings
+        self.state = "game"
+        self.paused = True
 
     def return_to_menu(self):
         self.state = "menu"
         self.paused = False
         self.reset_game()
+        self.wait_for_assets()
+        self.load_high_scores()
 
-    def draw_sidebar(self):
-        # Draw sidebar background
-        sidebar = pygame.Surface((200, WINDOW_HEIGHT))
+    def invalidate_layers(self):
+        # Drop the cached background layers so the next frame rebuilds them
+        self.grid_layer = None
+        self.sidebar_layer = None
+        self.sidebar_key = None
+
+    def build_sidebar_layer(self):
+        sidebar = pygame.Surface((200, self.screen.get_height()))
         sidebar.fill(COLORS['panel'])
-        self.screen.blit(sidebar, (0, 0))
 
         # Draw score
-        score_text = self.info_font.render(f'Score: {self.score}', True, COLORS['text'])
-        self.screen.blit(score_text, (20, 20))
+        score_text = self.text_cache.render(self.info_font, f'Score: {self.score}', True, COLORS['text'])
+        sidebar.blit(score_text, (20, 20))
 
         # Draw high score
         high_score = self.high_scores[self.current_difficulty]
-        high_score_text = self.info_font.render(f'Best: {high_score}', True, COLORS['text'])
-        self.screen.blit(high_score_text, (20, 60))
+        high_score_text = self.text_cache.render(self.info_font, f'Best: {high_score}', True, COLORS['text'])
+        sidebar.blit(high_score_text, (20, 60))
 
         # Draw difficulty
-        diff_text = self.info_font.render(self.current_difficulty, True, COLORS['accent1'])
-        self.screen.blit(diff_text, (20, 100))
+        diff_text = self.text_cache.render(self.info_font, self.current_difficulty, True, COLORS['accent1'])
+        sidebar.blit(diff_text, (20, 100))
+
+        # Autopilot indicator, red while it recently ran out of time
+        status = self.autopilot_status()
+        if status is not None:
+            color = COLORS['accent2'] if status == "over budget" else COLORS['accent3']
+            label = 'Autopilot: over budget' if status == "over budget" else 'Autopilot'
+            autopilot_text = self.text_cache.render(self.info_font, label, True, color)
+            sidebar.blit(autopilot_text, (20, sidebar.get_height() - 70))
 
         # Draw ESC key hint
-        esc_text = self.info_font.render('ESC - Back to Menu', True, COLORS['accent4'])
-        self.screen.blit(esc_text, (20, WINDOW_HEIGHT - 40))
+        esc_text = self.text_cache.render(self.info_font, 'ESC - Back to Menu', True, COLORS['accent4'])
+        sidebar.blit(esc_text, (20, sidebar.get_height() - 40))
+        return sidebar
+
+    def update_sidebar_layer(self):
+        # The sidebar only changes with the score, difficulty or window size;
+        # returns True when the layer had to be rebuilt
+        key = (self.screen.get_size(), self.current_difficulty, self.score,
+               self.high_scores[self.current_difficulty], self.autopilot_status())
+        if self.sidebar_layer is not None and key == self.sidebar_key:
+            return False
+        self.sidebar_layer = self.assets.surface("sidebar layer", self.build_sidebar_layer)
+        self.sidebar_key = key
+        return True
 
-    def draw_grid(self):
+    def draw_sidebar(self):
+        self.update_sidebar_layer()
+        self.screen.blit(self.sidebar_layer, (0, 0))
+
+    def build_grid_layer(self):
+        grid = pygame.Surface((GRID_WIDTH * GRID_SIZE, GRID_HEIGHT * GRID_SIZE))
+        grid.fill(COLORS['background'])
         for x in range(GRID_WIDTH):
             for y in range(GRID_HEIGHT):
-                rect = pygame.Rect(x * GRID_SIZE + 200, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                pygame.draw.rect(self.screen, COLORS['grid'], rect, 1)
+                rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+                pygame.draw.rect(grid, COLORS['grid'], rect, 1)
+        return grid
+
+    def draw_grid(self):
+        if self.grid_layer is None:
+            self.grid_layer = self.assets.surface("grid layer", self.build_grid_layer)
+        self.screen.blit(self.grid_layer, (200, 0))
+
+    def tick_length(self):
+        return 1.0 / self.difficulty_info["speed"]
+
+    def tick_blend(self):
+        # How far the current frame is between the last tick and the next
+        return min(self.tick_accumulator / self.tick_length(), 1.0)
+
+    def advance_game(self, dt):
+        # Run as many fixed-length ticks as the elapsed time covers. After a
+        # long stall only MAX_TICKS_PER_FRAME run and the rest is dropped.
+        if self.game_over and self.attract:
+            self.restart_timer += dt
+            if self.restart_timer >= ATTRACT_RESTART:
+                self.reset_game()
+            return
+        tick_length = self.tick_length()
+        self.tick_accumulator += dt
+        ticks = 0
+        while self.tick_accumulator >= tick_length and not self.game_over:
+            if ticks == MAX_TICKS_PER_FRAME:
+                self.tick_accumulator = 0.0
+                break
+            self.tick_accumulator -= tick_length
+            self.update_game()
+            ticks += 1
+
+    def update_game(self):
+        if self.world_view:
+            # The world view works out where segments came from itself;
+            # copying the whole body every tick would cost O(length)
+            old_tail = self.snake.positions[-1]
+            old_length = len(self.snake.positions)
+        else:
+            self.previous_positions = list(self.snake.positions)
+        if self.dirty_rects:
+            self.mark_dirty_cells()
+        if self.autopilot:
+            self.snake.direction = self.autopilot.choose(self.snake, self.food.position)
+            self.autopilot_used = True
+        else:
+            turn = self.turns.pop(self.snake.direction)
+            if turn is not None:
+                self.snake.direction = turn
+        self.recorder.record(self.snake.direction)
+        if not self.engine.step():
+            self.play_sound("crash")
+            if not self.autopilot_used:  # Autopilot games don't make the boards
+                self.record_high_score()
+            self.recorder.replay.save(LAST_REPLAY_FILE)
+            self.game_over = True
+            if self.streamer:
+                self.streamer.game_over(self.engine)
+        else:
+            if self.world_view:
+                self.world_view.advance(self.snake, old_tail, old_length)
+            if self.streamer:
+                self.streamer.tick(self.engine)
+            if self.engine.ate:
+                self.play_sound("eat")
+                self.score = self.engine.score
+        if self.dirty_rects:
+            self.mark_dirty_cells()
+
+    def mark_dirty_cells(self):
+        # Called around each tick: the head, tail and food cells are the
+        # only ones a tick can change
+        self.dirty_cells.add(self.snake.positions[0])
+        self.dirty_cells.add(self.snake.positions[-1])
+        self.dirty_cells.add(self.food.position)
+
+    def draw_dirty_cells(self):
+        # Restore each changed cell from the grid layer and redraw whatever
+        # sits on it; the food cell is always dirty because it pulses
+        self.dirty_cells.add(self.food.position)
+        self.dirty_cells.discard(None)
+        rects = []
+        for p in self.dirty_cells:
+            rect = pygame.Rect(p[0] * GRID_SIZE + 200, p[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+            self.screen.blit(self.grid_layer, rect, rect.move(-200, 0))
+            if self.snake.occupancy[p[1] * self.board_width + p[0]]:
+                self.snake.render_segment(self.screen, p)
+            rects.append(rect)
+        self.food.render(self.screen)
+        self.dirty_cells.clear()
+
+        # The score text lives in the sidebar
+        if self.update_sidebar_layer():
+            self.screen.blit(self.sidebar_layer, (0, 0))
+            rects.append(self.sidebar_layer.get_rect())
+        return rects
+
+    def toggle_autopilot(self):
+        self.autopilot_enabled = not self.autopilot_enabled
+        self.turns.clear()
+        self.autopilot = (Autopilot(self.board_width, self.board_height, self.engine.wall_collision)
+                          if self.autopilot_enabled else None)
+
+    def autopilot_status(self):
+        if self.autopilot is None:
+            return None
+        return "over budget" if self.autopilot.recently_over_budget() else "on"
+
+    def toggle_perf_hud(self):
+        self.show_perf_hud = not self.show_perf_hud
+        self.profiler.enabled = self.show_perf_hud or self.perf_stats_path is not None
+        self.hud_layer = None
+        self.presented_state = None  # One full redraw, to paint over a closed HUD
+
+    def build_hud_layer(self):
+        stats = self.profiler.stats()
+        line_height = 18
+        hud = pygame.Surface((180, line_height * (len(PHASES) + 1) + 8))
+        hud.fill(COLORS['panel'])
+        columns = (68, 96, 124, 152)
+        header = [('ms', 0)] + list(zip(('p50', 'p95', 'p99', 'max'), columns))
+        for label, x in header:
+            hud.blit(self.text_cache.render(self.hud_font, label, True, COLORS['accent4']), (x, 4))
+        for row, phase in enumerate(PHASES, 1):
+            y = 4 + row * line_height
+            hud.blit(self.text_cache.render(self.hud_font, phase, True, COLORS['text']), (0, y))
+            values = stats[phase]
+            for key, x in zip(('p50', 'p95', 'p99', 'max'), columns):
+                text = self.text_cache.render(self.hud_font, f"{values[key]:.1f}", True, COLORS['accent1'])
+                hud.blit(text, (x, y))
+        return hud
+
+    def draw_perf_hud(self):
+        # Rebuilt a few times a second; returns the screen area it covers
+        now = time.perf_counter()
+        if self.hud_layer is None or now - self.hud_updated >= HUD_REFRESH:
+            self.hud_layer = self.assets.surface("hud layer", self.build_hud_layer)
+            self.hud_updated = now
+        return self.screen.blit(self.hud_layer, (20, 140))
 
     def draw_pause_screen(self):
         # Draw semi-transparent overlay
@@ -424,7 +763,7 @@ class ModernGame:
         self.screen.blit(overlay, (0, 0))
 
         # Draw pause text
-        pause_text = self.title_font.render('PAUSED', True, COLORS['text'])
+        pause_text = self.text_cache.render(self.title_font, 'PAUSED', True, COLORS['text'])
         self.screen.blit(pause_text, (WINDOW_WIDTH//2 - pause_text.get_width()//2, WINDOW_HEIGHT//3))
 
         # Draw instructions
@@ -434,12 +773,13 @@ class ModernGame:
 
         instructions = [
             ('ESC', 'Return to Menu'),
-            ('SPACE', 'Resume Game')
+            ('SPACE', 'Resume Game'),
+            ('S', 'Save Game')
         ]
 
         for key, action in instructions:
-            key_text = self.subtitle_font.render(key, True, text_color)
-            action_text = self.subtitle_font.render(action, True, COLORS['text'])
+            key_text = self.text_cache.render(self.subtitle_font, key, True, text_color)
+            action_text = self.text_cache.render(self.subtitle_font, action, True, COLORS['text'])
             
             # Center both texts
             total_width = key_text.get_width() + 20 + action_text.get_width()
@@ -450,15 +790,23 @@ class ModernGame:
             y_pos += spacing
 
     def run(self):
+        profiler = self.profiler
+        started = False
         while True:
-            self.screen.fill(COLORS['background'])
+            profiler.begin_frame()
             events = pygame.event.get()
             
             # Handle events
             for event in events:
                 if event.type == pygame.QUIT:
+                    if self.perf_stats_path:
+                        self.profiler.export(self.perf_stats_path)
+                    if self.turns.measure:
+                        print(self.turns.report())
                     pygame.quit()
                     sys.exit()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.toggle_perf_hud()
                 elif event.type == pygame.KEYDOWN:
                     if self.state == "game":
                         if event.key == pygame.K_ESCAPE:
@@ -467,25 +815,40 @@ class ModernGame:
                         elif event.key == pygame.K_SPACE and self.paused:
                             self.paused = False
                             continue
-                        elif not self.paused:
-                            if event.key == pygame.K_UP and self.snake.direction != (0, 1):
-                                self.snake.direction = (0, -1)
-                            elif event.key == pygame.K_DOWN and self.snake.direction != (0, -1):
-                                self.snake.direction = (0, 1)
-                            elif event.key == pygame.K_LEFT and self.snake.direction != (1, 0):
-                                self.snake.direction = (-1, 0)
-                            elif event.key == pygame.K_RIGHT and self.snake.direction != (-1, 0):
-                                self.snake.direction = (1, 0)
+                        elif event.key == pygame.K_p and not self.paused and not self.game_over:
+                            self.paused = True
+                            continue
+                        elif event.key == pygame.K_s and self.paused:
+                            self.save_game()
+                            continue
+                        elif event.key == pygame.K_a and not self.paused:
+                            self.toggle_autopilot()
+                            continue
+                        elif not self.paused and event.key in KEY_DIRECTIONS:
+                            if self.autopilot:
+                                self.toggle_autopilot()  # The player takes over
+                            self.turns.push(KEY_DIRECTIONS[event.key], self.snake.direction)
                     elif self.state == "game_over" and event.key in [pygame.K_RETURN, pygame.K_SPACE]:
                         self.return_to_menu()
+                    elif self.state == "menu" and event.key == pygame.K_l:
+                        self.load_game()
                     elif self.paused:
                         if event.key == pygame.K_ESCAPE:
                             self.return_to_menu()
                             self.paused = False
             
+            profiler.mark("events")
+
+            # Anything but a steady gameplay frame is redrawn in full
+            frame_state = (self.state, self.paused, self.game_over)
+            partial = (self.dirty_rects and frame_state == ("game", False, False)
+                       and self.presented_state == frame_state)
+            if not partial:
+                self.screen.fill(COLORS['background'])
+
             # Update buttons only in menu state
-            if self.state == "menu":
-                pygame_widgets.update(events)
+            if self.state == "menu" and self.buttons:
+                widgets().update(events)
                 for button in self.buttons.values():
                     button.show()
                 if self.buttons['start'].clicked:
@@ -496,49 +859,44 @@ class ModernGame:
                     current_index = difficulties.index(self.current_difficulty)
                     self.current_difficulty = difficulties[(current_index + 1) % len(difficulties)]
                     self.difficulty_info = DIFFICULTY_FEATURES[self.current_difficulty]
-                    # Update button text
-                    self.buttons['difficulty'] = WidgetButton(
-                        self.screen, 
-                        self.buttons['difficulty'].getX(),
-                        self.buttons['difficulty'].getY(),
-                        self.buttons['difficulty'].getWidth(),
-                        self.buttons['difficulty'].getHeight(),
-                        text=f'Difficulty: {self.current_difficulty}',
-                        fontSize=28,
-                        margin=20,
-                        inactiveColour=(*COLORS['button'][:3], 200),
-                        hoverColour=COLORS['button_hover'],
-                        pressedColour=COLORS['accent1'],
-                        radius=25
-                    )
+                    self.update_difficulty_button()
             else:
                 for button in self.buttons.values():
                     button.hide()
+            profiler.mark("widgets")
             
             if self.state == "menu":
                 self.draw_menu()
             elif self.state == "game":
-                self.draw_grid()
-                self.draw_sidebar()
+                if not partial:
+                    if not self.world_view:
+                        self.draw_grid()
+                    self.draw_sidebar()
                 
-                if not self.game_over and not self.paused:
-                    if not self.snake.update(self.difficulty_info["wall_collision"]):
-                        if self.sounds["crash"]:
-                            self.sounds["crash"].play()
-                        if self.score > self.high_scores[self.current_difficulty]:
-                            self.high_scores[self.current_difficulty] = self.score
-                            self.save_high_scores()
-                        self.game_over = True
-
-                    if self.snake.get_head_position() == self.food.position:
-                        if self.sounds["eat"]:
-                            self.sounds["eat"].play()
-                        self.snake.grow = True
-                        self.food.randomize_position()
-                        self.score += int(10 * self.difficulty_info["score_multiplier"])
-
-                self.snake.render(self.screen)
-                self.food.render(self.screen)
+                profiler.mark("draw")
+                # Attract mode keeps advancing after a crash to count down
+                # to its restart
+                if not self.paused and (not self.game_over or self.attract):
+                    self.advance_game(self.frame_dt)
+                self.food.animate(self.frame_dt)
+                profiler.mark("simulation")
+
+                if partial:
+                    dirty_rects = self.draw_dirty_cells()
+                else:
+                    # Dirty-rect mode draws whole cells, so it skips the
+                    # in-between positions and the gradient (which shifts
+                    # along the whole body every tick)
+                    if self.world_view:
+                        self.world_view.draw(self.screen, self.snake, self.food, self.tick_blend())
+                        self.world_view.draw_minimap(self.screen, MINIMAP_POSITION, self.snake, self.food)
+                    elif self.dirty_rects:
+                        self.snake.render(self.screen, gradient=False)
+                        self.food.render(self.screen)
+                    else:
+                        self.snake.render(self.screen, self.previous_positions, self.tick_blend())
+                        self.food.render(self.screen)
+                    self.dirty_cells.clear()
 
                 if self.paused:
                     self.draw_pause_screen()
@@ -550,17 +908,82 @@ class ModernGame:
                 overlay.set_alpha(200)
                 self.screen.blit(overlay, (0, 0))
 
-                game_over = self.title_font.render('GAME OVER', True, COLORS['accent2'])
-                score_text = self.info_font.render(f'Final Score: {self.score}', True, COLORS['text'])
-                continue_text = self.info_font.render('Press ENTER to continue', True, COLORS['accent1'])
+                game_over = self.text_cache.render(self.title_font, 'GAME OVER', True, COLORS['accent2'])
+                score_text = self.text_cache.render(self.info_font, f'Final Score: {self.score}', True, COLORS['text'])
+                continue_text = self.text_cache.render(self.info_font, 'Press ENTER to continue', True, COLORS['accent1'])
                 
                 self.screen.blit(game_over, (WINDOW_WIDTH//2 - game_over.get_width()//2, WINDOW_HEIGHT//2 - 100))
                 self.screen.blit(score_text, (WINDOW_WIDTH//2 - score_text.get_width()//2, WINDOW_HEIGHT//2))
                 self.screen.blit(continue_text, (WINDOW_WIDTH//2 - continue_text.get_width()//2, WINDOW_HEIGHT//2 + 100))
 
-            pygame.display.flip()
-            self.clock.tick(DIFFICULTY_FEATURES[self.current_difficulty]["speed"])
+            if self.show_perf_hud:
+                hud_rect = self.draw_perf_hud()
+                if partial:
+                    dirty_rects.append(hud_rect)
+            profiler.mark("draw")
+
+            self.presented_state = frame_state
+            if partial:
+                pygame.display.update(dirty_rects)
+            else:
+                pygame.display.flip()
+            self.turns.presented()
+            profiler.mark("present")
+            profiler.end_frame()
+
+            if not started:
+                # The menu is up: add its buttons and load the rest in the
+                # background
+                started = True
+                self.startup.mark("first frame")
+                self.start_loading_assets()
+                self.setup_buttons()
+                self.startup.mark("buttons")
+            elif self.startup_report and not self.loader.is_alive():
+                print(self.startup.report())
+                print(self.assets.report())
+                pygame.quit()
+                sys.exit(0 if self.startup.within_budget() else 1)
+            self.frame_dt = self.clock.tick(self.render_fps) / 1000
+
+def parse_world_size(text):
+    try:
+        width, height = (int(side) for side in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected WIDTHxHEIGHT, e.g. 2000x2000")
+    if width < GRID_WIDTH or height < GRID_HEIGHT:
+        raise argparse.ArgumentTypeError(f"a world must be at least {GRID_WIDTH}x{GRID_HEIGHT}")
+    return width, height
+
 
 if __name__ == '__main__':
-    game = ModernGame()
+    parser = argparse.ArgumentParser(description="Modern Snake")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw and present only the cells that changed during gameplay")
+    parser.add_argument("--uncapped", action="store_true",
+                        help="render as fast as possible instead of at 60 FPS")
+    parser.add_argument("--perf-stats", metavar="PATH",
+                        help="record frame phase timings and write them to PATH (.csv or .json) on exit")
+    parser.add_argument("--autopilot", action="store_true",
+                        help="let the autopilot steer (A toggles it in game)")
+    parser.add_argument("--attract", action="store_true",
+                        help="kiosk demo: autopiloted games that restart on their own")
+    parser.add_argument("--world", metavar="WxH", type=parse_world_size,
+                        help="play on a large world (e.g. 2000x2000) seen through a scrolling camera")
+    parser.add_argument("--leaderboard", metavar="HOST:PORT",
+                        help="also submit scores to a leaderboard server (see leaderboard.py)")
+    parser.add_argument("--spectate", metavar="HOST:PORT",
+                        help="stream games to spectators connecting here (see spectator.py)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print startup timings against the time-to-first-frame budget and exit")
+    parser.add_argument("--input-latency", action="store_true",
+                        help="measure key-to-movement latency and print it on exit")
+    args = parser.parse_args()
+    game = ModernGame(dirty_rects=args.dirty_rects,
+                      render_fps=0 if args.uncapped else RENDER_FPS,
+                      perf_stats_path=args.perf_stats,
+                      leaderboard=args.leaderboard,
+                      autopilot=args.autopilot, attract=args.attract,
+                      world_size=args.world, spectate=args.spectate,
+                      startup_report=args.startup_report, input_latency=args.input_latency)
     game.run()
@@ -0,0 +1,179 @@
+import argparse
+import struct
+import sys
+import time
+
+from snake_engine import DIFFICULTY_FEATURES, DIRECTIONS, Snake, SnakeEngine
+
+# Replay file layout (little endian):
+#   header  magic, version, seed, difficulty index, board width/height,
+#           snake start x/y, points per food, tick count
+#   body    one varint per run of ticks that share a direction:
+#           (run_length << 2) | index into DIRECTIONS
+# Food placement comes from the seeded engine RNG, so seed + inputs is
+# enough to re-simulate the whole game.
+
+MAGIC = b"SNKR"
+VERSION = 1
+HEADER = struct.Struct("<4sBIBHHHHHI")
+SNAPSHOT_INTERVAL = 256  # Ticks between the player's seek snapshots
+DIFFICULTIES = list(DIFFICULTY_FEATURES)
+
+
+def write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    def __init__(self, seed, difficulty, width, height, start, food_score=10, runs=None):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.width = width
+        self.height = height
+        self.start = start
+        self.food_score = food_score
+        self.runs = runs if runs is not None else []  # [direction index, ticks] pairs
+
+    @property
+    def ticks(self):
+        return sum(count for _, count in self.runs)
+
+    def directions(self):
+        for code, count in self.runs:
+            direction = DIRECTIONS[code]
+            for _ in range(count):
+                yield direction
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(
+            MAGIC, VERSION, self.seed, DIFFICULTIES.index(self.difficulty),
+            self.width, self.height, self.start[0], self.start[1],
+            self.food_score, self.ticks
+        ))
+        for code, count in self.runs:
+            write_varint(out, count << 2 | code)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        (magic, version, seed, difficulty, width, height, start_x, start_y,
+         food_score, ticks) = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+
+        runs = []
+        offset = HEADER.size
+        while offset < len(data):
+            value, offset = read_varint(data, offset)
+            runs.append([value & 3, value >> 2])
+        replay = cls(seed, DIFFICULTIES[difficulty], width, height,
+                     (start_x, start_y), food_score, runs)
+        if replay.ticks != ticks:
+            raise ValueError("truncated replay file")
+        return replay
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    # Called once per simulation tick with the direction the snake is about
+    # to move in; consecutive equal directions collapse into one run.
+    def __init__(self, seed, difficulty, width, height, start, food_score=10):
+        self.replay = Replay(seed, difficulty, width, height, start, food_score)
+        self.codes = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+    def record(self, direction):
+        code = self.codes[direction]
+        runs = self.replay.runs
+        if runs and runs[-1][0] == code:
+            runs[-1][1] += 1
+        else:
+            runs.append([code, 1])
+
+
+class ReplayPlayer:
+    # Re-simulates a replay headless. Every SNAPSHOT_INTERVAL ticks it keeps
+    # an engine snapshot, so seek() only replays the ticks after the nearest
+    # one at or before the target.
+    def __init__(self, replay, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.replay = replay
+        self.snapshot_interval = snapshot_interval
+        self.moves = list(replay.directions())
+        self.engine = SnakeEngine.for_difficulty(
+            replay.difficulty, replay.width, replay.height,
+            snake=Snake(replay.width, replay.height, start=replay.start),
+            food_score=replay.food_score, seed=replay.seed
+        )
+        self.tick = 0
+        self.snapshots = {0: self.engine.snapshot()}
+
+    def step(self):
+        # Directions are applied as recorded, bypassing the engine's
+        # reverse-turn filter, so input quirks replay exactly
+        if self.tick >= len(self.moves):
+            return False
+        self.engine.snake.direction = self.moves[self.tick]
+        alive = self.engine.step()
+        self.tick += 1
+        if self.tick % self.snapshot_interval == 0:
+            self.snapshots.setdefault(self.tick, self.engine.snapshot())
+        return alive
+
+    def seek(self, tick):
+        tick = max(0, min(tick, len(self.moves)))
+        nearest = max(t for t in self.snapshots if t <= tick)
+        if not nearest <= self.tick <= tick:
+            self.engine.restore(self.snapshots[nearest])
+            self.tick = nearest
+        while self.tick < tick:
+            self.step()
+        return self.engine
+
+    def run(self):
+        while self.step():
+            pass
+        return self.engine
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-simulate a Modern Snake replay headless")
+    parser.add_argument("path")
+    parser.add_argument("--seek", type=int, help="stop at this tick instead of the end")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.path)
+    player = ReplayPlayer(replay)
+    start = time.perf_counter()
+    engine = player.seek(args.seek) if args.seek is not None else player.run()
+    elapsed = time.perf_counter() - start
+
+    print(f"{replay.difficulty} seed={replay.seed} tick={player.tick}/{len(player.moves)}")
+    print(f"score={engine.score} length={len(engine.snake.positions)} game_over={engine.game_over}")
+    print(f"simulated in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,262 @@
+import heapq
+import json
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# High scores live in three files next to each other:
+#   <path>.json  compacted snapshot: the top-K scores of every difficulty
+#   <path>.log   append-only JSON lines, one per score recorded since then
+#   <path>.lock  held (flock/msvcrt) by whichever process reads or writes
+# Every log line is fsynced before record() returns, so a crash loses at
+# most the line being written (a torn last line is skipped on load).
+# Both files start with a generation number. Compaction writes the next
+# generation's snapshot, then swaps in an empty log of that generation;
+# a log older than its snapshot is already folded in and gets ignored, so
+# a crash between the two renames never counts a score twice.
+
+TOP_K = 10
+COMPACT_AFTER = 256  # Log lines before they are folded into the snapshot
+SNAPSHOT_VERSION = 1
+
+
+def _fsync_dir(path):
+    # Makes a rename durable; directories can't be opened on Windows
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path)
+
+
+def _encode(record):
+    return (json.dumps(record, separators=(',', ':')) + "\n").encode()
+
+
+class ScoreStore:
+    # Per-difficulty top-K leaderboards shared by every game process on the
+    # machine. Each board is a min-heap of (score, time) capped at top_k
+    # entries, so loading reads K entries per difficulty plus at most
+    # compact_after log lines, however many games have been played.
+    def __init__(self, path="high_scores", top_k=TOP_K, compact_after=COMPACT_AFTER,
+                 legacy_path=None, legacy_difficulties=None):
+        self.snapshot_path = f"{path}.json"
+        self.log_path = f"{path}.log"
+        self.lock_path = f"{path}.lock"
+        self.top_k = top_k
+        self.compact_after = compact_after
+        self.boards = {}
+        self.generation = 0
+        self.log_offset = 0  # Bytes of the log already applied to `boards`
+        self.log_entries = 0
+        self.lock_file = open(self.lock_path, 'a+b')
+        with self.locked():
+            self.reload()
+            if legacy_path and not self.generation and not self.log_entries:
+                self.import_legacy(legacy_path, legacy_difficulties)
+
+    @contextmanager
+    def locked(self):
+        fd = self.lock_file.fileno()
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def close(self):
+        self.lock_file.close()
+
+    def best(self, difficulty):
+        board = self.boards.get(difficulty)
+        return max(board)[0] if board else 0
+
+    def top(self, difficulty):
+        # Highest first
+        return [score for score, _ in sorted(self.boards.get(difficulty, ()), reverse=True)]
+
+    def qualifies(self, difficulty, score):
+        board = self.boards.get(difficulty, ())
+        return score > 0 and (len(board) < self.top_k or score > board[0][0])
+
+    def push(self, difficulty, score, when):
+        board = self.boards.setdefault(difficulty, [])
+        if len(board) < self.top_k:
+            heapq.heappush(board, (score, when))
+        elif score > board[0][0]:
+            heapq.heapreplace(board, (score, when))
+
+    def record(self, difficulty, score):
+        # Returns True if the score made the difficulty's top-K
+        return bool(self.record_many([(difficulty, score)]))
+
+    def record_many(self, scores):
+        # Appends every (difficulty, score) that makes its board with a
+        # single write and fsync; returns the ones that did
+        with self.locked():
+            self.refresh_locked()
+            when = int(time.time())
+            accepted = []
+            for difficulty, score in scores:
+                if self.qualifies(difficulty, score):
+                    self.push(difficulty, score, when)
+                    accepted.append((difficulty, score))
+            if not accepted:
+                return accepted
+            if not self.log_offset:
+                # No log of the current generation yet (or a stale one)
+                self.start_log()
+            data = b"".join(_encode({"difficulty": difficulty, "score": score, "time": when})
+                            for difficulty, score in accepted)
+            fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND)
+            try:
+                size = os.fstat(fd).st_size
+                if size > self.log_offset:
+                    # A torn line from a crashed writer: end it so it can't
+                    # swallow this one
+                    data = b"\n" + data
+                os.write(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self.log_offset = size + len(data)
+            self.log_entries += len(accepted)
+            if self.log_entries >= self.compact_after:
+                self.compact_locked()
+            return accepted
+
+    def refresh(self):
+        # Pick up scores other processes recorded since the last call
+        with self.locked():
+            self.refresh_locked()
+
+    def compact(self):
+        with self.locked():
+            self.refresh_locked()
+            self.compact_locked()
+
+    def refresh_locked(self):
+        try:
+            with open(self.log_path, 'rb') as f:
+                header = f.readline()
+                if self.read_generation(header) != self.generation:
+                    # Another process compacted: start over from its snapshot
+                    self.reload()
+                    return
+                f.seek(self.log_offset)
+                self.apply_log(f.read())
+        except FileNotFoundError:
+            self.reload()
+
+    def reload(self):
+        self.boards = {}
+        self.generation = 0
+        self.log_offset = 0
+        self.log_entries = 0
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = json.load(f)
+            self.generation = snapshot["generation"]
+            for difficulty, entries in snapshot["scores"].items():
+                for score, when in entries:
+                    self.push(difficulty, score, when)
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError):
+            # An old single-score high_scores.json or a damaged file; the
+            # snapshot is only ever replaced whole, so this isn't a torn write
+            self.boards = {}
+            self.generation = 0
+
+        try:
+            with open(self.log_path, 'rb') as f:
+                header = f.readline()
+                if self.read_generation(header) == self.generation:
+                    self.log_offset = len(header)
+                    self.apply_log(f.read())
+        except FileNotFoundError:
+            pass
+
+    def read_generation(self, header):
+        try:
+            return json.loads(header)["generation"]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def apply_log(self, data):
+        # Only whole lines count; a torn write at the end is left for the
+        # next read (or dropped by the next compaction)
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+                self.push(entry["difficulty"], entry["score"], entry["time"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            self.log_entries += 1
+        self.log_offset += end
+
+    def start_log(self):
+        header = _encode({"generation": self.generation})
+        _write_atomic(self.log_path, header)
+        self.log_offset = len(header)
+        self.log_entries = 0
+
+    def compact_locked(self):
+        scores = {difficulty: sorted(board, reverse=True)
+                  for difficulty, board in self.boards.items()}
+        self.generation += 1
+        _write_atomic(self.snapshot_path, json.dumps({
+            "version": SNAPSHOT_VERSION,
+            "generation": self.generation,
+            "top_k": self.top_k,
+            "scores": scores,
+        }).encode())
+        self.start_log()
+
+    def import_legacy(self, path, difficulties=None):
+        # One-off import of the old flat {difficulty: best score} file,
+        # limited to `difficulties` when given. Anything else (such as
+        # another store's snapshot written over it) is left alone: its
+        # boards belong to a different game.
+        try:
+            with open(path, 'r') as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(legacy, dict) or "generation" in legacy or "scores" in legacy:
+            return
+        now = int(time.time())
+        for difficulty, score in legacy.items():
+            if difficulties is not None and difficulty not in difficulties:
+                continue
+            if isinstance(score, int) and score > 0:
+                self.push(difficulty, score, now)
+        self.compact_locked()
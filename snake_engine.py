@@ -0,0 +1,436 @@
+import math
+import random
+import struct
+from array import array
+from collections import deque
+from itertools import accumulate, compress
+
+import numpy as np
+
+# Headless game rules shared by every front-end. Nothing in here may import
+# pygame: bots and regression farms step this module without a display.
+
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+OPPOSITE = {
+    UP: DOWN,
+    DOWN: UP,
+    LEFT: RIGHT,
+    RIGHT: LEFT,
+}
+
+DIFFICULTY_FEATURES = {
+    "Beginner": {
+        "speed": 6,
+        "score_multiplier": 1,
+        "grow_amount": 1,
+        "wall_collision": False,  # Can pass through walls
+        "description": "Perfect for beginners!"
+    },
+    "Easy": {
+        "speed": 8,
+        "score_multiplier": 1.2,
+        "grow_amount": 1,
+        "wall_collision": False,
+        "description": "A gentle challenge"
+    },
+    "Medium": {
+        "speed": 12,
+        "score_multiplier": 1.5,
+        "grow_amount": 1,
+        "wall_collision": False,
+        "description": "The classic experience"
+    },
+    "Hard": {
+        "speed": 16,
+        "score_multiplier": 2,
+        "grow_amount": 2,
+        "wall_collision": True,  # Die on wall collision
+        "description": "For skilled players"
+    },
+    "Expert": {
+        "speed": 20,
+        "score_multiplier": 2.5,
+        "grow_amount": 2,
+        "wall_collision": True,
+        "description": "A true challenge"
+    },
+    "Master": {
+        "speed": 25,
+        "score_multiplier": 3,
+        "grow_amount": 3,
+        "wall_collision": True,
+        "description": "Only for the best!"
+    }
+}
+
+
+FREE_TABLE = bytes([1] + [0] * 255)  # Occupancy count -> 1 if the cell is empty
+
+
+class FreeCells:
+    # Cells no snake segment covers, kept as a swap-remove array plus each
+    # cell's slot in it, so add, remove and uniform sampling are all O(1).
+    # Sampling depends on the order of `cells`, so a saved order can be
+    # passed back in to reproduce later placements. Both are typed arrays
+    # so huge boards cost 8 bytes a cell rather than a pair of int objects.
+    __slots__ = ("cells", "slots")
+
+    def __init__(self, size, cells=None):
+        if cells is None:
+            self.cells = array('i', range(size))
+            self.slots = array('i', range(size))
+        else:
+            # A saved order (any sequence or buffer of cell ids); slots are
+            # scattered in one NumPy pass, not a per-cell Python loop
+            order = np.asarray(cells, dtype=np.int32)
+            slots = np.full(size, -1, dtype=np.int32)
+            slots[order] = np.arange(len(order), dtype=np.int32)
+            self.cells = array('i', order.tobytes())
+            self.slots = array('i', slots.tobytes())
+
+    @classmethod
+    def from_occupancy(cls, occupancy):
+        # Empty cells in ascending order; a cell's slot is the number of
+        # empty cells before it. Built with C-level iterators, no per-cell
+        # Python loop.
+        free_cells = cls.__new__(cls)
+        size = len(occupancy)
+        free = occupancy.translate(FREE_TABLE)
+        free_cells.cells = array('i', compress(range(size), free))
+        free_cells.slots = array('i', accumulate(free, initial=0))
+        del free_cells.slots[size]
+        for cell in compress(range(size), occupancy):
+            free_cells.slots[cell] = -1
+        return free_cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.slots[cell] >= 0
+
+    def add(self, cell):
+        self.slots[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def remove(self, cell):
+        slot = self.slots[cell]
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[slot] = last
+            self.slots[last] = slot
+        self.slots[cell] = -1
+
+    def choice(self, rng):
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class Snake:
+    __slots__ = ("width", "height", "start", "grow_amount", "positions", "occupancy",
+                 "free_cells", "direction", "grow", "pending_growth", "length")
+
+    def __init__(self, width, height, start=None):
+        self.width = width
+        self.height = height
+        self.start = start if start is not None else (width // 2, height // 2)
+        self.grow_amount = 1
+        self.reset()
+
+    def reset(self):
+        self.load_positions([self.start])
+        self.direction = RIGHT
+        self.grow = False
+        self.pending_growth = 0
+        self.length = 1
+
+    def load_positions(self, positions, free_cells=None):
+        # The body is a deque of (x, y) cells, head first. `occupancy` counts
+        # the segments on each cell (encoded as y * width + x) so moving,
+        # growing and collision checks never walk the body; `free_cells`
+        # mirrors the empty cells for food placement.
+        self.positions = deque(positions)
+        self.occupancy = bytearray(self.width * self.height)
+        for x, y in self.positions:
+            self.occupancy[y * self.width + x] += 1
+        if free_cells is None:
+            self.free_cells = FreeCells.from_occupancy(self.occupancy)
+        else:
+            self.free_cells = FreeCells(self.width * self.height, free_cells)
+
+    def get_head_position(self):
+        return self.positions[0]
+
+    def update(self, wall_collision=False):
+        positions = self.positions
+        current = positions[0]
+        x, y = self.direction
+        new_x = current[0] + x
+        new_y = current[1] + y
+
+        # Handle wall collision based on difficulty
+        if wall_collision:
+            if new_x < 0 or new_x >= self.width or new_y < 0 or new_y >= self.height:
+                return False
+        else:
+            new_x %= self.width
+            new_y %= self.height
+        new = (new_x, new_y)
+        cell = new_y * self.width + new_x
+
+        # Same rule as checking `new in positions[2:]`: the head and neck
+        # never count, while the tail does even though it is about to move.
+        occupancy = self.occupancy
+        occupied = occupancy[cell]
+        if occupied:
+            if new == current:
+                occupied -= 1
+            if len(positions) > 1 and new == positions[1]:
+                occupied -= 1
+            if occupied:
+                return False
+
+        if self.grow:
+            # Queue multiple segments based on grow_amount
+            self.grow = False
+            self.pending_growth += self.grow_amount
+            self.length += self.grow_amount
+
+        positions.appendleft(new)
+        if not occupancy[cell]:
+            self.free_cells.remove(cell)
+        occupancy[cell] += 1
+        if self.pending_growth:
+            self.pending_growth -= 1
+        else:
+            tail_x, tail_y = positions.pop()
+            tail = tail_y * self.width + tail_x
+            occupancy[tail] -= 1
+            if not occupancy[tail]:
+                self.free_cells.add(tail)
+        return True
+
+
+class Food:
+    __slots__ = ("width", "height", "rng", "position")
+
+    def __init__(self, width, height, rng=None):
+        self.width = width
+        self.height = height
+        self.rng = rng if rng is not None else random
+        self.position = (0, 0)
+        self.randomize_position()
+
+    def randomize_position(self, snake=None):
+        # With a snake the food always lands on a free cell; position is None
+        # when the board is full.
+        if snake is None:
+            self.position = (self.rng.randrange(self.width),
+                             self.rng.randrange(self.height))
+        elif snake.free_cells:
+            cell = snake.free_cells.choice(self.rng)
+            self.position = (cell % self.width, cell // self.width)
+        else:
+            self.position = None
+
+
+class GameState:
+    # Compact copy of an engine at one tick: the body and free-cell order as
+    # arrays of cell ids, everything else as plain fields. It serializes to
+    # a versioned binary blob; loading reads the arrays straight out of the
+    # buffer without copying them.
+    __slots__ = ("width", "height", "start", "wall_collision", "grow_amount",
+                 "points", "difficulty", "seed", "direction", "grow",
+                 "pending_growth", "length", "food", "score", "ticks",
+                 "game_over", "body", "free_cells", "rng_state", "extra")
+
+    MAGIC = b"SNKS"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBBBBBBBBHHHHIIiIIIIIIId")
+    NO_DIFFICULTY = 255
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def to_bytes(self):
+        difficulties = list(DIFFICULTY_FEATURES)
+        difficulty = (difficulties.index(self.difficulty) if self.difficulty is not None
+                      else self.NO_DIFFICULTY)
+        version, internal, gauss = self.rng_state
+        rng_words = array('I', internal)
+        extra = self.extra or b""
+        header = self.HEADER.pack(
+            self.MAGIC, self.VERSION, self.body.itemsize, difficulty,
+            self.wall_collision, self.grow_amount, DIRECTIONS.index(self.direction),
+            self.grow, self.game_over, self.width, self.height,
+            self.start[0], self.start[1], self.pending_growth, self.length,
+            -1 if self.food is None else self.food[1] * self.width + self.food[0],
+            self.points, self.score, self.ticks, self.seed or 0,
+            len(self.body), len(self.free_cells), len(extra),
+            math.nan if gauss is None else gauss
+        )
+        return b"".join((header, self.body, self.free_cells, rng_words, extra))
+
+    @classmethod
+    def from_bytes(cls, data):
+        view = memoryview(data)
+        (magic, version, itemsize, difficulty, wall_collision, grow_amount,
+         direction, grow, game_over, width, height, start_x, start_y,
+         pending_growth, length, food, points, score, ticks, seed,
+         body_length, free_length, extra_length, gauss) = cls.HEADER.unpack_from(view)
+        if magic != cls.MAGIC:
+            raise ValueError("not a saved game")
+        if version != cls.VERSION:
+            raise ValueError(f"unsupported saved game version {version}")
+
+        typecode = 'H' if itemsize == 2 else 'I'
+        offset = cls.HEADER.size
+        body = view[offset:offset + body_length * itemsize].cast(typecode)
+        offset += body_length * itemsize
+        free_cells = view[offset:offset + free_length * itemsize].cast(typecode)
+        offset += free_length * itemsize
+        rng_words = view[offset:offset + 625 * 4].cast('I')
+        offset += 625 * 4
+        extra = view[offset:offset + extra_length]
+
+        return cls(
+            width=width, height=height, start=(start_x, start_y),
+            wall_collision=bool(wall_collision), grow_amount=grow_amount, points=points,
+            difficulty=(None if difficulty == cls.NO_DIFFICULTY
+                        else list(DIFFICULTY_FEATURES)[difficulty]),
+            seed=seed, direction=DIRECTIONS[direction], grow=bool(grow),
+            pending_growth=pending_growth, length=length,
+            food=None if food < 0 else (food % width, food // width),
+            score=score, ticks=ticks, game_over=bool(game_over),
+            body=body, free_cells=free_cells,
+            rng_state=(3, tuple(rng_words), None if math.isnan(gauss) else gauss),
+            extra=bytes(extra) or None
+        )
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class SnakeEngine:
+    def __init__(self, width, height, wall_collision=False, grow_amount=1,
+                 score_multiplier=1, food_score=10, snake=None, food=None,
+                 seed=None):
+        self.width = width
+        self.height = height
+        self.wall_collision = wall_collision
+        self.points = int(food_score * score_multiplier)
+        self.snake = snake if snake is not None else Snake(width, height)
+        self.snake.grow_amount = grow_amount
+        self.difficulty = None
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.food = food if food is not None else Food(width, height)
+        self.food.rng = self.rng
+        self.food.randomize_position(self.snake)
+        self.score = 0
+        self.ticks = 0
+        self.ate = False
+        self.game_over = False
+
+    @classmethod
+    def for_difficulty(cls, difficulty, width, height, **kwargs):
+        features = DIFFICULTY_FEATURES[difficulty]
+        engine = cls(width, height,
+                     wall_collision=features["wall_collision"],
+                     grow_amount=features["grow_amount"],
+                     score_multiplier=features["score_multiplier"],
+                     **kwargs)
+        engine.difficulty = difficulty
+        return engine
+
+    @classmethod
+    def from_state(cls, state, snake=None, food=None):
+        # Rebuild a saved game; `snake`/`food` let front-ends supply their
+        # own subclasses
+        if snake is None:
+            snake = Snake(state.width, state.height, start=state.start)
+        engine = cls(state.width, state.height,
+                     wall_collision=state.wall_collision,
+                     grow_amount=state.grow_amount,
+                     food_score=state.points,
+                     snake=snake, food=food, seed=state.seed)
+        engine.difficulty = state.difficulty
+        engine.restore(state)
+        return engine
+
+    def step(self, action=None):
+        # Advance one tick. `action` is a direction tuple or None to keep
+        # going straight; a 180 degree turn is ignored. Returns False once
+        # the snake has crashed.
+        self.ate = False
+        if self.game_over:
+            return False
+
+        snake = self.snake
+        if action is not None and action != OPPOSITE.get(snake.direction):
+            snake.direction = action
+
+        if not snake.update(self.wall_collision):
+            self.game_over = True
+            return False
+        self.ticks += 1
+
+        if snake.positions[0] == self.food.position:
+            snake.grow = True
+            self.food.randomize_position(snake)
+            self.score += self.points
+            self.ate = True
+        return True
+
+    def snapshot(self):
+        # Everything needed to carry on from this tick, RNG included
+        snake = self.snake
+        width = self.width
+        typecode = 'H' if width * self.height <= 0xFFFF else 'I'
+        return GameState(
+            width=width, height=self.height, start=snake.start,
+            wall_collision=self.wall_collision, grow_amount=snake.grow_amount,
+            points=self.points, difficulty=self.difficulty, seed=self.seed,
+            direction=snake.direction, grow=snake.grow,
+            pending_growth=snake.pending_growth, length=snake.length,
+            food=self.food.position, score=self.score, ticks=self.ticks,
+            game_over=self.game_over,
+            body=array(typecode, [y * width + x for x, y in snake.positions]),
+            free_cells=self.free_cell_order(typecode),
+            rng_state=self.rng.getstate()
+        )
+
+    def free_cell_order(self, typecode):
+        # Cell ids are never negative, so for 'I' the bytes copy as they are
+        cells = self.snake.free_cells.cells
+        if typecode == 'I':
+            return array('I', cells.tobytes())
+        return array(typecode, cells)
+
+    def restore(self, state):
+        snake = self.snake
+        width = self.width
+        snake.load_positions([(cell % width, cell // width) for cell in state.body],
+                             state.free_cells)
+        snake.direction = state.direction
+        snake.grow = state.grow
+        snake.pending_growth = state.pending_growth
+        snake.length = state.length
+        self.food.position = state.food
+        self.rng.setstate(state.rng_state)
+        self.score = state.score
+        self.ticks = state.ticks
+        self.game_over = state.game_over
+        self.ate = False
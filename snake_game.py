@@ -1,6 +1,6 @@
 import pygame
-import random
 import sys
+from snake_engine import Food as EngineFood, Snake as EngineSnake, SnakeEngine
 
 # Initialize Pygame
 pygame.init()
@@ -21,50 +21,22 @@ GREEN = (0, 255, 0)
 # Game settings
 SNAKE_SPEED = 15
 
-class Snake:
+class Snake(EngineSnake):
     def __init__(self):
-        self.positions = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-        self.direction = (1, 0)
-        self.grow = False
-
-    def get_head_position(self):
-        return self.positions[0]
-
-    def update(self):
-        current = self.get_head_position()
-        x, y = self.direction
-        new = ((current[0] + x) % GRID_WIDTH, (current[1] + y) % GRID_HEIGHT)
-        
-        if new in self.positions[2:]:
-            return False
-        
-        self.positions.insert(0, new)
-        if not self.grow:
-            self.positions.pop()
-        else:
-            self.grow = False
-        return True
-
-    def reset(self):
-        self.positions = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-        self.direction = (1, 0)
-        self.grow = False
+        super().__init__(GRID_WIDTH, GRID_HEIGHT)
 
     def render(self, surface):
         for p in self.positions:
             pygame.draw.rect(surface, GREEN, 
                            (p[0] * GRID_SIZE, p[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
 
-class Food:
+class Food(EngineFood):
     def __init__(self):
-        self.position = (0, 0)
-        self.randomize_position()
-
-    def randomize_position(self):
-        self.position = (random.randint(0, GRID_WIDTH - 1),
-                        random.randint(0, GRID_HEIGHT - 1))
+        super().__init__(GRID_WIDTH, GRID_HEIGHT)
 
     def render(self, surface):
+        if self.position is None:  # Board is full
+            return
         pygame.draw.rect(surface, RED,
                         (self.position[0] * GRID_SIZE, 
                          self.position[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
@@ -80,6 +52,8 @@ class Game:
     def reset_game(self):
         self.snake = Snake()
         self.food = Food()
+        self.engine = SnakeEngine(GRID_WIDTH, GRID_HEIGHT, food_score=1,
+                                  snake=self.snake, food=self.food)
         self.score = 0
 
     def handle_keys(self):
@@ -102,15 +76,13 @@ class Game:
             self.handle_keys()
             
             # Update snake position
-            if not self.snake.update():
+            if not self.engine.step():
                 self.reset_game()
                 continue
 
             # Check for food collision
-            if self.snake.get_head_position() == self.food.position:
-                self.snake.grow = True
-                self.food.randomize_position()
-                self.score += 1
+            if self.engine.ate:
+                self.score = self.engine.score
 
             # Draw everything
             self.screen.fill(BLACK)
@@ -0,0 +1,348 @@
+import argparse
+import asyncio
+import socket
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+
+from leaderboard import parse_address
+from replay import DIFFICULTIES, read_varint, write_varint
+
+# Live game streaming for spectators (lobby screens, remote renderers).
+# A subscriber gets a keyframe with the whole game, then one small delta
+# per tick: the new head cell, how many tail cells to trim, the food cell
+# if it moved and the score change. Bandwidth per tick is the same for a
+# one-cell snake and a 100k-cell one.
+#
+# Stream layout (little endian): a HELLO (magic + version), then frames,
+# each a u32 payload length and the payload. Payloads start with a type:
+#   KEYFRAME  tick, board width/height, difficulty index, score, food
+#             cell, body length, body cells (u32, head first)
+#   DELTA     tick, head cell, trim count, flags, [food cell], [varint score delta]
+#   GAME_OVER tick
+# Cells are y * width + x; NO_FOOD marks a full board.
+
+MAGIC = b"SNKV"  # Not SNKS, the save files' tag
+VERSION = 1
+HELLO = MAGIC + bytes([VERSION])
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8767
+NO_FOOD = 0xFFFFFFFF
+
+LENGTH = struct.Struct("<I")
+KEYFRAME = struct.Struct("<BIHHBIII")
+DELTA = struct.Struct("<BIIBB")
+GAME_OVER = struct.Struct("<BI")
+CELL = struct.Struct("<I")
+TYPE_KEYFRAME = 1
+TYPE_DELTA = 2
+TYPE_GAME_OVER = 3
+FLAG_FOOD = 1
+FLAG_SCORE = 2
+
+HIGH_WATER = 256 * 1024  # Unsent bytes before a subscriber stops getting deltas
+LOW_WATER = 16 * 1024  # Unsent bytes below which it is resynced with a keyframe
+
+
+def frame(payload):
+    return LENGTH.pack(len(payload)) + payload
+
+
+def food_cell(position, width):
+    return NO_FOOD if position is None else position[1] * width + position[0]
+
+
+def encode_keyframe(tick, width, height, difficulty, score, food, body):
+    # `body` is an iterable of cells, head first
+    cells = array('I', body)
+    return (KEYFRAME.pack(TYPE_KEYFRAME, tick, width, height, difficulty, score, food, len(cells))
+            + cells.tobytes())
+
+
+class StreamMirror:
+    # The game as seen by a subscriber, rebuilt from keyframes and deltas.
+    # The streamer keeps one too, to make keyframes for new subscribers
+    # without asking the game thread.
+    def __init__(self):
+        self.ready = False  # Seen a keyframe
+        self.width = self.height = 0
+        self.difficulty = 0
+        self.tick = 0
+        self.score = 0
+        self.food = NO_FOOD
+        self.body = deque()
+        self.game_over = False
+
+    def apply(self, payload):
+        kind = payload[0]
+        if kind == TYPE_KEYFRAME:
+            (_, self.tick, self.width, self.height, self.difficulty, self.score,
+             self.food, length) = KEYFRAME.unpack_from(payload)
+            cells = array('I')
+            cells.frombytes(payload[KEYFRAME.size:KEYFRAME.size + 4 * length])
+            self.body = deque(cells)
+            self.game_over = False
+            self.ready = True
+        elif not self.ready:
+            return
+        elif kind == TYPE_DELTA:
+            _, self.tick, head, trim, flags = DELTA.unpack_from(payload)
+            offset = DELTA.size
+            if flags & FLAG_FOOD:
+                self.food = CELL.unpack_from(payload, offset)[0]
+                offset += CELL.size
+            if flags & FLAG_SCORE:
+                delta, offset = read_varint(payload, offset)
+                self.score += delta
+            body = self.body
+            body.appendleft(head)
+            for _ in range(trim):
+                body.pop()
+        elif kind == TYPE_GAME_OVER:
+            self.tick = GAME_OVER.unpack_from(payload)[1]
+            self.game_over = True
+
+    def keyframe(self):
+        return encode_keyframe(self.tick, self.width, self.height, self.difficulty,
+                               self.score, self.food, self.body)
+
+    def positions(self):
+        width = self.width
+        return [(cell % width, cell // width) for cell in self.body]
+
+
+class StateStreamer:
+    # Game-side publisher. The game thread only encodes a fixed-size delta
+    # per tick and hands it over; a daemon thread with its own event loop
+    # owns the sockets and does the fan-out. A subscriber that can't keep up
+    # stops getting deltas and is resynced with a keyframe once it drains,
+    # so nobody's backlog grows without bound and nobody slows the game.
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        # Last published values, game thread only
+        self.width = 0
+        self.length = 0
+        self.food = None
+        self.score = 0
+        self.frames = 0
+        self.bytes = 0
+
+        # Server thread only
+        self.mirror = StreamMirror()
+        self.subscribers = {}  # writer -> waiting for a resync
+        self.loop = asyncio.new_event_loop()
+        self.address = None
+        self.error = None
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self.run, args=(host, port, ready),
+                                       name="spectate", daemon=True)
+        self.thread.start()
+        ready.wait()
+        if self.error:
+            raise self.error
+
+    def run(self, host, port, ready):
+        asyncio.set_event_loop(self.loop)
+        try:
+            server = self.loop.run_until_complete(
+                asyncio.start_server(self.handle_subscriber, host, port))
+        except OSError as e:
+            self.error = e
+            ready.set()
+            return
+        self.address = server.sockets[0].getsockname()[:2]
+        ready.set()
+        self.loop.run_forever()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    # Game thread
+
+    def publish(self, payload):
+        self.frames += 1
+        self.bytes += LENGTH.size + len(payload)
+        self.loop.call_soon_threadsafe(self.fan_out, payload)
+
+    def keyframe(self, engine):
+        # O(length): only when a game starts or is loaded
+        width = engine.width
+        snake = engine.snake
+        self.width = width
+        self.length = len(snake.positions)
+        self.food = engine.food.position
+        self.score = engine.score
+        self.publish(encode_keyframe(
+            engine.ticks, width, engine.height, DIFFICULTIES.index(engine.difficulty),
+            engine.score, food_cell(self.food, width),
+            (y * width + x for x, y in snake.positions)))
+
+    def tick(self, engine):
+        # After a successful step: the snake gained a head and lost
+        # `trim` tail cells
+        snake = engine.snake
+        head_x, head_y = snake.positions[0]
+        length = len(snake.positions)
+        trim = self.length + 1 - length
+        self.length = length
+        flags = 0
+        extra = bytearray()
+        if engine.food.position != self.food:
+            self.food = engine.food.position
+            flags |= FLAG_FOOD
+            extra += CELL.pack(food_cell(self.food, self.width))
+        if engine.score != self.score:
+            flags |= FLAG_SCORE
+            write_varint(extra, engine.score - self.score)
+            self.score = engine.score
+        self.publish(DELTA.pack(TYPE_DELTA, engine.ticks, head_y * self.width + head_x, trim, flags)
+                     + extra)
+
+    def game_over(self, engine):
+        self.publish(GAME_OVER.pack(TYPE_GAME_OVER, engine.ticks))
+
+    # Server thread
+
+    def fan_out(self, payload):
+        self.mirror.apply(payload)
+        data = frame(payload)
+        for writer, stale in list(self.subscribers.items()):
+            if writer.is_closing():
+                continue
+            buffered = writer.transport.get_write_buffer_size()
+            if stale:
+                if buffered < LOW_WATER:
+                    writer.write(frame(self.mirror.keyframe()))
+                    self.subscribers[writer] = False
+            elif buffered > HIGH_WATER:
+                self.subscribers[writer] = True
+            else:
+                writer.write(data)
+
+    async def handle_subscriber(self, reader, writer):
+        writer.write(HELLO)
+        if self.mirror.ready:
+            writer.write(frame(self.mirror.keyframe()))
+        self.subscribers[writer] = False
+        try:
+            # Spectators don't send anything; wait for them to hang up
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.pop(writer, None)
+            writer.close()
+
+
+class SpectatorClient:
+    # Blocking reader for viewers: poll() takes whatever has arrived
+    # without waiting and applies it to `mirror`
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.sock = socket.create_connection((host, port), timeout=5)
+        hello = b""
+        while len(hello) < len(HELLO):
+            chunk = self.sock.recv(len(HELLO) - len(hello))
+            if not chunk:
+                raise ConnectionError("stream closed")
+            hello += chunk
+        if hello[:4] != MAGIC:
+            raise ValueError("not a game stream")
+        if hello[4] != VERSION:
+            raise ValueError(f"unsupported stream version {hello[4]}")
+        self.sock.setblocking(False)
+        self.buffer = bytearray()
+        self.mirror = StreamMirror()
+        self.frames = 0
+        self.bytes = len(HELLO)
+
+    def poll(self):
+        # Returns False once the stream has ended
+        while True:
+            try:
+                chunk = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                return False
+            self.buffer += chunk
+            self.bytes += len(chunk)
+        buffer = self.buffer
+        offset = 0
+        while len(buffer) - offset >= LENGTH.size:
+            length = LENGTH.unpack_from(buffer, offset)[0]
+            end = offset + LENGTH.size + length
+            if end > len(buffer):
+                break
+            self.mirror.apply(bytes(buffer[offset + LENGTH.size:end]))
+            self.frames += 1
+            offset = end
+        del buffer[:offset]
+        return True
+
+    def close(self):
+        self.sock.close()
+
+
+def watch(client, scale_to=(800, 600)):
+    import pygame
+
+    pygame.init()
+    screen = pygame.display.set_mode(scale_to)
+    pygame.display.set_caption("Modern Snake - Spectator")
+    font = pygame.font.Font(None, 28)
+    clock = pygame.time.Clock()
+    while client.poll():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return
+        mirror = client.mirror
+        screen.fill((18, 18, 18))
+        if mirror.ready:
+            width, height = mirror.width, mirror.height
+            size = max(1, min(scale_to[0] // width, (scale_to[1] - 40) // height))
+            origin = ((scale_to[0] - width * size) // 2, 40)
+            pygame.draw.rect(screen, (40, 40, 40), (*origin, width * size, height * size), 1)
+            color = (200, 60, 60) if mirror.game_over else (130, 200, 40)
+            for cell in mirror.body:
+                screen.fill(color, (origin[0] + cell % width * size, origin[1] + cell // width * size,
+                                    size, size))
+            if mirror.food != NO_FOOD:
+                screen.fill((255, 90, 90), (origin[0] + mirror.food % width * size,
+                                            origin[1] + mirror.food // width * size, size, size))
+            text = f"{DIFFICULTIES[mirror.difficulty]}  Score: {mirror.score}  Length: {len(mirror.body)}"
+            screen.blit(font.render(text, True, (230, 230, 230)), (10, 10))
+        pygame.display.flip()
+        clock.tick(60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a Modern Snake game streamed with --spectate")
+    parser.add_argument("address", nargs="?", default=f"{DEFAULT_HOST}:{DEFAULT_PORT}",
+                        metavar="HOST:PORT")
+    parser.add_argument("--stats", type=float, metavar="SECONDS",
+                        help="don't open a window; report bandwidth for this long")
+    args = parser.parse_args(argv)
+
+    client = SpectatorClient(*parse_address(args.address))
+    try:
+        if args.stats is None:
+            watch(client)
+            return 0
+        end = time.monotonic() + args.stats
+        while time.monotonic() < end and client.poll():
+            time.sleep(0.01)
+        mirror = client.mirror
+        print(f"{client.frames} frames, {client.bytes} bytes "
+              f"({client.bytes / max(client.frames, 1):.1f} bytes/frame), "
+              f"tick {mirror.tick}, length {len(mirror.body)}, score {mirror.score}")
+    finally:
+        client.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
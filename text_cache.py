@@ -0,0 +1,44 @@
+from collections import OrderedDict
+
+from assets import display_format
+
+
+class TextCache:
+    # Bounded LRU cache of rendered text surfaces keyed by
+    # (font, text, antialias, color). Font.render ignores the alpha of the
+    # colour, so only its RGB part is part of the key. Entries nobody asked
+    # for recently (old score strings and the like) fall off the end.
+    # Surfaces are kept in the display's pixel format.
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, tuple(color[:3]))
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = display_format(font.render(text, antialias, key[3]))
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,235 @@
+import math
+from array import array
+
+import pygame
+
+from assets import display_format
+
+# Rendering for boards far bigger than the window. A camera follows the
+# snake's head and only the cells inside the viewport are looked at, so a
+# frame costs the same on a 2000x2000 world with a 100k-segment snake as
+# on the regular board.
+#
+# Segments are found through the board's occupancy grid rather than by
+# walking the body. Each cell remembers the tick the head entered it
+# (`stamps`), which gives a segment's place in the body (for the gradient)
+# and, through the neighbour entered one tick earlier, where it slid from
+# (for interpolation).
+
+MINIMAP_SIZE = 160  # Largest side of the minimap in pixels
+
+
+class Camera:
+    # Top-left corner of the viewport in (fractional) world cells. Wrapping
+    # worlds scroll across the edges; walled ones stop at them.
+    def __init__(self, world_width, world_height, viewport, cell_size, wrap):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.viewport = viewport
+        self.cell_size = cell_size
+        self.wrap = wrap
+        self.cols = viewport.width / cell_size
+        self.rows = viewport.height / cell_size
+        self.x = 0.0
+        self.y = 0.0
+
+    def follow(self, x, y):
+        # Centre the viewport on the middle of cell (x, y)
+        x = x + 0.5 - self.cols / 2
+        y = y + 0.5 - self.rows / 2
+        if self.wrap:
+            self.x = x % self.world_width
+            self.y = y % self.world_height
+        else:
+            self.x = min(max(x, 0.0), max(self.world_width - self.cols, 0.0))
+            self.y = min(max(y, 0.0), max(self.world_height - self.rows, 0.0))
+
+    def to_screen(self, x, y):
+        # Screen pixel of the top-left of world point (x, y), or None when
+        # the cell there can't overlap the viewport
+        dx = x - self.x
+        dy = y - self.y
+        if self.wrap:
+            dx %= self.world_width
+            dy %= self.world_height
+            # Just left of / above the camera rather than a world away
+            if dx > self.world_width - 1:
+                dx -= self.world_width
+            if dy > self.world_height - 1:
+                dy -= self.world_height
+        if dx <= -1 or dy <= -1 or dx >= self.cols or dy >= self.rows:
+            return None
+        return (self.viewport.x + round(dx * self.cell_size),
+                self.viewport.y + round(dy * self.cell_size))
+
+    def visible_cells(self):
+        # Every cell that overlaps the viewport, as (x, y)
+        left = math.floor(self.x)
+        top = math.floor(self.y)
+        xs = range(left, left + math.ceil(self.cols) + 1)
+        ys = range(top, top + math.ceil(self.rows) + 1)
+        if self.wrap:
+            xs = [x % self.world_width for x in xs]
+            ys = [y % self.world_height for y in ys]
+        else:
+            xs = [x for x in xs if x < self.world_width]
+            ys = [y for y in ys if y < self.world_height]
+        return [(x, y) for y in ys for x in xs]
+
+
+class Minimap:
+    # The whole world shrunk so each pixel covers a square block of cells.
+    # Every pixel keeps a count of the segments in its block and is only
+    # repainted when that count goes to or from zero, so keeping it up to
+    # date costs O(1) per tick.
+    def __init__(self, world_width, world_height, colors, size=MINIMAP_SIZE):
+        self.world_width = world_width
+        self.cells_per_pixel = max(1, math.ceil(max(world_width, world_height) / size))
+        self.width = math.ceil(world_width / self.cells_per_pixel)
+        self.height = math.ceil(world_height / self.cells_per_pixel)
+        self.colors = colors
+        self.counts = array('I', bytes(4 * self.width * self.height))
+        self.surface = display_format(pygame.Surface((self.width, self.height)))
+
+    def reset(self, positions):
+        self.counts = array('I', bytes(4 * self.width * self.height))
+        self.surface.fill(self.colors['background'])
+        for x, y in positions:
+            self.add(x, y)
+
+    def add(self, x, y):
+        px, py = x // self.cells_per_pixel, y // self.cells_per_pixel
+        index = py * self.width + px
+        self.counts[index] += 1
+        if self.counts[index] == 1:
+            self.surface.set_at((px, py), self.colors['snake'])
+
+    def remove(self, x, y):
+        px, py = x // self.cells_per_pixel, y // self.cells_per_pixel
+        index = py * self.width + px
+        self.counts[index] -= 1
+        if not self.counts[index]:
+            self.surface.set_at((px, py), self.colors['background'])
+
+    def draw(self, surface, topleft, camera, food, head):
+        # Returns the screen area it covers
+        rect = surface.blit(self.surface, topleft)
+        scale = self.cells_per_pixel
+        if food is not None:
+            surface.fill(self.colors['food'], (topleft[0] + food[0] // scale - 1,
+                                               topleft[1] + food[1] // scale - 1, 3, 3))
+        surface.fill(self.colors['head'], (topleft[0] + head[0] // scale - 1,
+                                           topleft[1] + head[1] // scale - 1, 3, 3))
+        # Viewport outline; on wrapping worlds it may be cut at the edge
+        view = pygame.Rect(topleft[0] + int(camera.x / scale), topleft[1] + int(camera.y / scale),
+                           max(2, math.ceil(camera.cols / scale)), max(2, math.ceil(camera.rows / scale)))
+        pygame.draw.rect(surface, self.colors['frame'], view.clip(rect), 1)
+        pygame.draw.rect(surface, self.colors['frame'], rect.inflate(2, 2), 1)
+        return rect.inflate(2, 2)
+
+
+class WorldView:
+    def __init__(self, world_width, world_height, viewport, cell_size, wrap, colors,
+                 minimap_size=MINIMAP_SIZE):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.viewport = viewport
+        self.cell_size = cell_size
+        self.wrap = wrap
+        self.colors = colors
+        self.camera = Camera(world_width, world_height, viewport, cell_size, wrap)
+        self.minimap = Minimap(world_width, world_height, colors, minimap_size)
+        self.stamps = array('I', bytes(4 * world_width * world_height))
+        self.head_stamp = 0
+        self.popped_tail = None  # Where the tail was before the last tick
+        # Grid lines one cell larger than the viewport, shifted by the
+        # camera's sub-cell offset when blitted
+        self.grid = pygame.Surface((viewport.width + cell_size, viewport.height + cell_size))
+        self.grid.fill(colors['background'])
+        for x in range(0, self.grid.get_width(), cell_size):
+            pygame.draw.line(self.grid, colors['grid'], (x, 0), (x, self.grid.get_height()))
+        for y in range(0, self.grid.get_height(), cell_size):
+            pygame.draw.line(self.grid, colors['grid'], (0, y), (self.grid.get_width(), y))
+        self.grid = display_format(self.grid)
+
+    def reset(self, snake):
+        # O(length): only at the start of a game or after loading one
+        positions = snake.positions
+        self.head_stamp = len(positions)
+        width = self.world_width
+        for i, (x, y) in enumerate(positions):
+            self.stamps[y * width + x] = self.head_stamp - i
+        self.popped_tail = None
+        self.minimap.reset(positions)
+
+    def advance(self, snake, old_tail, old_length):
+        # Called after every tick the snake survived
+        x, y = snake.positions[0]
+        self.head_stamp += 1
+        self.stamps[y * self.world_width + x] = self.head_stamp
+        self.minimap.add(x, y)
+        if len(snake.positions) == old_length:
+            self.popped_tail = old_tail
+            self.minimap.remove(*old_tail)
+        else:
+            self.popped_tail = None
+
+    def previous_cell(self, snake, x, y, index):
+        # The cell a segment slid in from: wherever the next segment
+        # towards the tail is now (the head entered it one tick earlier)
+        if index == len(snake.positions) - 1:
+            return self.popped_tail or (x, y)
+        width, height = self.world_width, self.world_height
+        stamp = self.stamps[y * width + x] - 1
+        occupancy = snake.occupancy
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nx, ny = (x + dx) % width, (y + dy) % height
+            cell = ny * width + nx
+            if occupancy[cell] and self.stamps[cell] == stamp:
+                return (nx, ny)
+        return (x, y)
+
+    def draw(self, surface, snake, food, blend=1.0):
+        camera = self.camera
+        head_x, head_y = snake.positions[0]
+        head = snake.interpolate(self.previous_cell(snake, head_x, head_y, 0),
+                                 (head_x, head_y), blend)
+        camera.follow(*head)
+
+        surface.set_clip(self.viewport)
+        size = self.cell_size
+        offset = (self.viewport.x - round((camera.x % 1) * size),
+                  self.viewport.y - round((camera.y % 1) * size))
+        surface.blit(self.grid, offset)
+
+        atlas = snake.atlas
+        steps = len(atlas.areas)
+        length = len(snake.positions)
+        occupancy = snake.occupancy
+        stamps = self.stamps
+        width = self.world_width
+        blits = []
+        for x, y in camera.visible_cells():
+            cell = y * width + x
+            if not occupancy[cell]:
+                continue
+            index = self.head_stamp - stamps[cell]
+            p = (x, y)
+            if blend < 1.0:
+                p = snake.interpolate(self.previous_cell(snake, x, y, index), p, blend)
+            position = camera.to_screen(*p)
+            if position is not None:
+                blits.append((atlas.surface, (position[0] + 2, position[1] + 2),
+                              atlas.areas[min(index * steps // length, steps - 1)]))
+        # Tail first so the head ends up on top
+        blits.sort(key=lambda blit: blit[2].x, reverse=True)
+        surface.blits(blits, doreturn=False)
+
+        if food.position is not None:
+            position = camera.to_screen(*food.position)
+            if position is not None:
+                food.render(surface, position)
+        surface.set_clip(None)
+
+    def draw_minimap(self, surface, topleft, snake, food):
+        return self.minimap.draw(surface, topleft, self.camera, food.position, snake.positions[0])